@@ -0,0 +1,162 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import degrees
+from snapshot import load_snapshot
+
+# Default number of sampled source people and seed for reproducible samples
+SAMPLE = 1000
+SEED = 50
+
+# Sources per task handed to a worker process
+CHUNK_SIZE = 32
+
+# Graph mapped from the snapshot in each worker process
+worker_graph = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Degrees-of-separation statistics over many BFS sources."
+    )
+    parser.add_argument("directory")
+    sources = parser.add_mutually_exclusive_group()
+    sources.add_argument("--sample", type=positive_int, default=SAMPLE,
+                         help="number of random source people")
+    sources.add_argument("--all", action="store_true",
+                         help="run a BFS from every person")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--eccentricities", metavar="FILE",
+                        help="write each source's eccentricity to a CSV file")
+    args = parser.parse_args()
+
+    # Builds the snapshot the workers map, if it is missing or stale
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args.directory, "snapshot")
+    print("Data loaded.", file=sys.stderr)
+    if load_snapshot(args.directory, tables=False) is None:
+        sys.exit(f"Could not write a snapshot in {args.directory}; "
+                 "workers need one to share the graph.")
+
+    people = len(degrees.graph.person_ids)
+    if people == 0:
+        sys.exit("No people to analyze.")
+    if args.all:
+        sources = list(range(people))
+    else:
+        sources = random.Random(SEED).sample(range(people), min(args.sample, people))
+
+    start = time.perf_counter()
+    results, diameter = analyze(args.directory, sources, args.workers)
+    elapsed = time.perf_counter() - start
+
+    report(results, diameter, people, elapsed, args.workers)
+    if args.eccentricities:
+        write_eccentricities(args.eccentricities, results)
+
+
+def positive_int(value):
+    """
+    Parses a command line count that must be at least 1.
+    """
+    count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {count}")
+    return count
+
+
+def analyze(directory, sources, workers):
+    """
+    Runs a BFS from every source person index on a pool of `workers`
+    processes. Returns {source: (level_sizes, farthest)} and a lower bound
+    on the diameter.
+
+    Workers map the snapshot of `directory` themselves, so the graph is
+    shared through the page cache instead of being pickled to each one.
+    """
+    chunks = [sources[i:i + CHUNK_SIZE] for i in range(0, len(sources), CHUNK_SIZE)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(directory,)) as pool:
+        for chunk_results in pool.map(bfs_chunk, chunks):
+            results.update(chunk_results)
+        if not results:
+            return results, 0
+
+        # Double sweep: a BFS from the farthest person found tightens the
+        # diameter lower bound without skewing the sampled statistics
+        sizes, farthest = max(results.values(), key=lambda result: len(result[0]))
+        diameter = len(sizes) - 1
+        if farthest not in results:
+            sweep = pool.submit(bfs_chunk, [farthest]).result()
+            diameter = max(diameter, len(sweep[farthest][0]) - 1)
+    return results, diameter
+
+
+def init_worker(directory):
+    """
+    Maps the snapshot arrays once per worker process.
+    """
+    global worker_graph
+    cached = load_snapshot(directory, tables=False)
+    if cached is None:
+        raise RuntimeError(f"no fresh snapshot in {directory}")
+    worker_graph, _ = cached
+
+
+def bfs_chunk(sources):
+    """
+    Returns {source: (level_sizes, farthest)} for a chunk of sources.
+    """
+    return {source: worker_graph.level_sizes(source) for source in sources}
+
+
+def report(results, diameter, people, elapsed, workers):
+    """
+    Prints the distance histogram, eccentricity summary and approximate
+    diameter of a set of BFS results.
+    """
+    histogram = {}
+    unreachable = 0
+    for sizes, _ in results.values():
+        for distance, size in enumerate(sizes[1:], start=1):
+            histogram[distance] = histogram.get(distance, 0) + size
+        unreachable += people - sum(sizes)
+
+    pairs = sum(histogram.values())
+    eccentricities = [len(sizes) - 1 for sizes, _ in results.values()]
+    print(f"{len(results)} sources, {workers} workers, {elapsed:.2f}s")
+    print("Degrees of separation:")
+    for distance in sorted(histogram):
+        print(f"  {distance}: {histogram[distance]} "
+              f"({histogram[distance] / pairs:.2%})")
+    print(f"  not connected: {unreachable}")
+    if pairs:
+        mean = sum(d * count for d, count in histogram.items()) / pairs
+        print(f"Mean separation: {mean:.3f}")
+    if eccentricities:
+        print(f"Eccentricity: min {min(eccentricities)}, max {max(eccentricities)}, "
+              f"mean {sum(eccentricities) / len(eccentricities):.3f}")
+    print(f"Approximate diameter (lower bound): {diameter}")
+
+
+def write_eccentricities(filename, results):
+    """
+    Writes one row of person_id, name and eccentricity per BFS source.
+    """
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "name", "eccentricity"])
+        for source in sorted(results):
+            person_id = degrees.graph.person_ids[source]
+            writer.writerow([person_id, degrees.people[person_id]["name"],
+                             len(results[source][0]) - 1])
+
+
+if __name__ == "__main__":
+    main()
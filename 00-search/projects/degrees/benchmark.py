@@ -0,0 +1,264 @@
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import degrees
+from util import Node, PriorityFrontier, QueueFrontier, StackFrontier
+
+# Number of random person pairs to query and seed for reproducible samples
+PAIRS = 100
+SEED = 50
+
+# Nodes pushed through each frontier by the frontier microbenchmark
+FRONTIER_NODES = 20000
+
+# Loaders compared by the peak-RSS benchmark, each run in a fresh process
+LOADERS = ("dict", "csr", "stream")
+RSS_SCRIPT = """
+import resource, sys, time
+import degrees
+start = time.perf_counter()
+degrees.load_data(sys.argv[1], sys.argv[2])
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in bytes on macOS and KiB elsewhere
+print(rss // 1024 if sys.platform == "darwin" else rss, elapsed)
+"""
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "frontiers":
+        if len(sys.argv) > 3:
+            sys.exit("Usage: python benchmark.py frontiers [nodes]")
+        benchmark_frontiers(int(sys.argv[2]) if len(sys.argv) > 2 else FRONTIER_NODES)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "rss":
+        if len(sys.argv) > 3:
+            sys.exit("Usage: python benchmark.py rss [directory]")
+        benchmark_rss(sys.argv[2] if len(sys.argv) > 2 else "large")
+        return
+
+    if len(sys.argv) not in range(2, 5) or sys.argv[1] not in BENCHMARKS:
+        sys.exit("Usage: python benchmark.py "
+                 f"{'|'.join(BENCHMARKS)} [directory] [pairs]\n"
+                 "       python benchmark.py frontiers [nodes]\n"
+                 "       python benchmark.py rss [directory]")
+    directory = sys.argv[2] if len(sys.argv) > 2 else "large"
+    pairs = int(sys.argv[3]) if len(sys.argv) > 3 else PAIRS
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    queries = sample_pairs(pairs, SEED)
+    BENCHMARKS[sys.argv[1]](queries)
+
+
+def benchmark_bidirectional(queries):
+    """
+    Compares nodes expanded and wall time of the unidirectional and
+    bidirectional searches.
+    """
+    searches = [
+        ("unidirectional", degrees.shortest_path),
+        ("bidirectional", degrees.bidirectional_shortest_path)
+    ]
+    results = {}
+    for name, search in searches:
+        results[name] = run_search(search, queries)
+
+    # Both searches must agree on the degrees of separation for every pair
+    lengths = [path_lengths for _, _, path_lengths in results.values()]
+    if any(other != lengths[0] for other in lengths[1:]):
+        sys.exit("Searches disagree on path lengths.")
+
+    print(f"{len(queries)} random pairs")
+    for name, (expanded, elapsed, _) in results.items():
+        print(f"  {name}: {expanded} nodes expanded, {elapsed:.3f}s")
+
+
+def benchmark_memory(queries):
+    """
+    Compares peak frontier size and peak traced memory of the original
+    Node-based BFS against the parent-map BFS in degrees.shortest_path.
+    """
+    searches = [
+        ("node bfs", node_shortest_path),
+        ("parent map bfs", degrees.shortest_path)
+    ]
+    print(f"{len(queries)} random pairs")
+    for name, search in searches:
+        peak_frontier = 0
+        peak_memory = 0
+        total_memory = 0
+        for source, target in queries:
+            stats = {}
+            tracemalloc.start()
+            search(source, target, stats)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_frontier = max(peak_frontier, stats["peak_frontier"])
+            peak_memory = max(peak_memory, peak)
+            total_memory += peak
+        print(f"  {name}: peak frontier {peak_frontier}, "
+              f"peak memory {peak_memory / 1024:.1f} KiB, "
+              f"mean peak memory {total_memory / len(queries) / 1024:.1f} KiB")
+
+
+def node_shortest_path(source, target, stats):
+    """
+    The original degrees BFS, kept as the baseline for benchmark_memory: a
+    Node per generated edge, visited checks on dequeue and the goal test
+    when the target is dequeued.
+    """
+    frontier = QueueFrontier()
+    frontier.add(Node(source, None, None))
+    visited = set()
+    stats["peak_frontier"] = 1
+
+    while not frontier.empty():
+        current_node = frontier.remove()
+        if current_node.state in visited:
+            continue
+        visited.add(current_node.state)
+
+        if current_node.state == target:
+            path = []
+            while current_node.parent:
+                path.append((current_node.action, current_node.state))
+                current_node = current_node.parent
+            path.reverse()
+            return path
+
+        for movie_id, person_id in degrees.neighbors_for_person(current_node.state):
+            frontier.add(Node(person_id, current_node, movie_id))
+        stats["peak_frontier"] = max(stats["peak_frontier"], len(frontier.frontier))
+
+    return None
+
+
+def benchmark_frontiers(count):
+    """
+    Times add, contains_state and remove on every frontier class with
+    `count` nodes, next to the original list-slicing queue frontier.
+    """
+    rng = random.Random(SEED)
+    costs = [rng.random() for _ in range(count)]
+    frontiers = [
+        ("slicing queue (original)", SlicingQueueFrontier),
+        ("StackFrontier", StackFrontier),
+        ("QueueFrontier", QueueFrontier),
+        ("PriorityFrontier", PriorityFrontier)
+    ]
+
+    print(f"{count} nodes per frontier")
+    for name, frontier_class in frontiers:
+        frontier = frontier_class()
+
+        start = time.perf_counter()
+        for state, cost in enumerate(costs):
+            frontier.add(Node(state, None, None, cost))
+        added = time.perf_counter()
+
+        # Membership is probed for as many states as there are nodes
+        for state in range(count):
+            frontier.contains_state(state)
+        checked = time.perf_counter()
+
+        while not frontier.empty():
+            frontier.remove()
+        removed = time.perf_counter()
+
+        print(f"  {name}: add {added - start:.4f}s, "
+              f"contains_state {checked - added:.4f}s, "
+              f"remove {removed - checked:.4f}s")
+
+
+def benchmark_rss(directory):
+    """
+    Loads `directory` with every loader in a fresh interpreter and reports
+    each one's peak resident set size and load time.
+    """
+    print(f"Peak RSS after load_data({directory!r})")
+    for backend in LOADERS:
+        output = subprocess.run(
+            [sys.executable, "-c", RSS_SCRIPT, directory, backend],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        rss, elapsed = int(output[0]), float(output[1])
+        print(f"  {backend}: {rss / 1024:.1f} MiB, {elapsed:.2f}s")
+
+
+class SlicingQueueFrontier():
+    """
+    The original util.QueueFrontier, which rebuilt its list on every removal
+    and scanned it for contains_state, kept as a baseline.
+    """
+
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        node = self.frontier[0]
+        self.frontier = self.frontier[1:]
+        return node
+
+
+def sample_pairs(count, seed):
+    """
+    Returns a list of `count` random (source, target) person_id pairs,
+    drawn reproducibly from `seed`.
+    """
+    rng = random.Random(seed)
+    person_ids = sorted(degrees.people)
+    return [(rng.choice(person_ids), rng.choice(person_ids))
+            for _ in range(count)]
+
+
+def run_search(search, queries):
+    """
+    Runs `search` on every query and returns the total number of nodes
+    expanded, the total wall time and the list of path lengths.
+    """
+    neighbors_for_person = degrees.neighbors_for_person
+    expanded = 0
+
+    # Count expansions by wrapping the neighbor function the searches call
+    def counting_neighbors(person_id):
+        nonlocal expanded
+        expanded += 1
+        return neighbors_for_person(person_id)
+
+    degrees.neighbors_for_person = counting_neighbors
+    try:
+        path_lengths = []
+        start = time.perf_counter()
+        for source, target in queries:
+            path = search(source, target)
+            path_lengths.append(None if path is None else len(path))
+        elapsed = time.perf_counter() - start
+    finally:
+        degrees.neighbors_for_person = neighbors_for_person
+
+    return expanded, elapsed, path_lengths
+
+
+BENCHMARKS = {
+    "bidirectional": benchmark_bidirectional,
+    "memory": benchmark_memory
+}
+
+
+if __name__ == "__main__":
+    main()
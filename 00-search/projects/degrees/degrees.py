@@ -1,7 +1,12 @@
 import csv
 import sys
+from array import array
+from collections import deque
 
-from util import Node, StackFrontier, QueueFrontier
+from graph import BFSTreeCache, Graph, INDEX_TYPE
+from nameindex import NameIndex
+from snapshot import load_snapshot, save_snapshot
+from stream import load_stream
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,20 +17,72 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Integer-indexed CSR graph, set when loading with the "csr" backend
+graph = None
 
-def load_data(directory):
+# Cache of full BFS trees for repeated sources, created on first use
+tree_cache = None
+
+# Prefix and fuzzy lookup over the keys of names, built by load_data
+name_index = None
+
+# Command line flags accepted by main
+FLAGS = {"--bidirectional", "--csr", "--snapshot", "--stream"}
+
+
+def load_data(directory, backend="dict"):
     """
     Load data from CSV files into memory.
+
+    The "dict" backend keeps a set of movies per person and of stars per
+    movie. The "csr" backend leaves those sets out and stores the
+    person <-> movie edges in the global `graph` instead. The "snapshot"
+    backend is "csr" cached in a binary snapshot next to the CSV files,
+    which is memory-mapped instead of parsing CSV while it is fresh. The
+    "stream" backend is "csr" loaded in chunks with only IDs and names kept
+    in memory; `people` and `movies` then read display fields from the CSV
+    files on demand.
+
+    Every backend also builds `name_index` for prefix and fuzzy lookups.
+    """
+    global name_index
+    load_records(directory, backend)
+    name_index = NameIndex(names)
+
+
+def load_records(directory, backend):
+    """
+    Load names, people, movies and the graph for one load_data backend.
     """
+    global graph, tree_cache, names, people, movies
+    if backend not in ("dict", "csr", "snapshot", "stream"):
+        raise ValueError(f"unknown backend {backend!r}")
+    csr = backend != "dict"
+    graph = None
+    tree_cache = None
+    names, people, movies = {}, {}, {}
+
+    if backend == "stream":
+        graph, names, people, movies = load_stream(directory)
+        return
+
+    if backend == "snapshot":
+        cached = load_snapshot(directory)
+        if cached is not None:
+            graph, tables = cached
+            load_tables(tables)
+            return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             people[row["id"]] = {
                 "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
+                "birth": row["birth"]
             }
+            if not csr:
+                people[row["id"]]["movies"] = set()
             if row["name"].lower() not in names:
                 names[row["name"].lower()] = {row["id"]}
             else:
@@ -37,9 +94,20 @@ def load_data(directory):
         for row in reader:
             movies[row["id"]] = {
                 "title": row["title"],
-                "year": row["year"],
-                "stars": set()
+                "year": row["year"]
             }
+            if not csr:
+                movies[row["id"]]["stars"] = set()
+
+    if csr:
+        load_graph(directory)
+        if backend == "snapshot":
+            try:
+                save_snapshot(directory, graph, people, movies)
+            except OSError:
+                # A read-only data directory just means no cache next time
+                pass
+        return
 
     # Load stars
     with open(f"{directory}/stars.csv", encoding="utf-8") as f:
@@ -52,14 +120,68 @@ def load_data(directory):
                 pass
 
 
+def load_tables(tables):
+    """
+    Fill `names`, `people` and `movies` from the display tables of a
+    snapshot.
+    """
+    for person_id, name, birth in zip(
+        tables["person_ids"], tables["names"], tables["births"]
+    ):
+        people[person_id] = {"name": name, "birth": birth}
+        names.setdefault(name.lower(), set()).add(person_id)
+
+    for movie_id, title, year in zip(
+        tables["movie_ids"], tables["titles"], tables["years"]
+    ):
+        movies[movie_id] = {"title": title, "year": year}
+
+
+def load_graph(directory):
+    """
+    Load stars from CSV into the global CSR `graph`, interning person and
+    movie IDs to their position in `people` and `movies`.
+    """
+    global graph
+    person_ids = list(people)
+    movie_ids = list(movies)
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    edge_people = array(INDEX_TYPE)
+    edge_movies = array(INDEX_TYPE)
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                person = person_index[row["person_id"]]
+                movie = movie_index[row["movie_id"]]
+            except KeyError:
+                continue
+            edge_people.append(person)
+            edge_movies.append(movie)
+
+    graph = Graph.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if len(args) > 1 or any(flag not in FLAGS for flag in flags):
+        sys.exit("Usage: python degrees.py [--bidirectional] [--csr | --snapshot | --stream] [directory]")
+    directory = args[0] if args else "large"
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    if "--snapshot" in flags:
+        backend = "snapshot"
+    elif "--stream" in flags:
+        backend = "stream"
+    elif "--csr" in flags:
+        backend = "csr"
+    else:
+        backend = "dict"
+    load_data(directory, backend)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +191,10 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    if "--bidirectional" in flags:
+        path = bidirectional_shortest_path(source, target)
+    else:
+        path = shortest_path(source, target)
 
     if path is None:
         print("Not connected.")
@@ -84,7 +209,7 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
@@ -92,51 +217,181 @@ def shortest_path(source, target):
     If no possible path, returns None.
 
     Source and target come in as name ids.
-    Can use, BFS to find shortest path using QueueFrontier class from the provided util.py in the distribution code.
-    Noticed implementation of QueueFrontier currently has an O(N) runtime complexity for removals. This can be optimized by using a deque for O(1) pops from the front of deque.
+    BFS over a deque frontier with a single parent map instead of Node
+    objects. People are marked as seen when they are enqueued, so each
+    person enters the frontier at most once, and the goal is tested as
+    soon as the target is generated rather than when it is dequeued.
+
+    If a `stats` dict is given, it receives the number of people expanded
+    and the peak frontier size.
     """
+    if graph is not None:
+        return graph.shortest_path(source, target, stats)
+
+    # Maps person_id to the (movie_id, person_id) pair it was reached from
+    parents = {source: None}
+    frontier = deque([source])
+    expanded = 0
+    peak_frontier = 1
+
+    try:
+        if source == target:
+            return []
+        while frontier:
+            person_id = frontier.popleft()
+            expanded += 1
+            for movie_id, costar_id in neighbors_for_person(person_id):
+                if costar_id in parents:
+                    continue
+                parents[costar_id] = (movie_id, person_id)
+                if costar_id == target:
+                    return path_from_parents(parents, target)
+                frontier.append(costar_id)
+            if len(frontier) > peak_frontier:
+                peak_frontier = len(frontier)
+        return None
+    finally:
+        if stats is not None:
+            stats["expanded"] = expanded
+            stats["peak_frontier"] = peak_frontier
+
+
+def path_from_parents(parents, target):
+    """
+    Follows `parents` back from the target to the search root and returns
+    the list of (movie_id, person_id) pairs from the root to the target.
+    """
+    path = []
+    person_id = target
+    while parents[person_id] is not None:
+        movie_id, previous_id = parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = previous_id
+    path.reverse()
+    return path
+
 
-    # Backtracks and returns list of (movie_id, person_id) pairs from source to target nodes
-    def get_path(end_node):
-        current_node = end_node
-        path_to_target_node = []
-        while current_node.parent:
-            path_to_target_node.append((current_node.action, current_node.state))
-            current_node = current_node.parent
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the same shortest list of (movie_id, person_id) pairs as
+    shortest_path, but grows one BFS frontier from the source and one from
+    the target until they meet in the middle.
 
-        path_to_target_node.reverse()
-        return path_to_target_node
+    Each step expands a whole level of whichever frontier is smaller, so
+    the search touches roughly two balls of radius d/2 instead of one ball
+    of radius d. If no possible path, returns None.
+    """
+    if source == target:
+        return []
 
-    frontier = QueueFrontier() # Using queue for BFS to find shortest path
-    frontier.add(Node(source, None, None))
-    visited = set()
+    # Maps person_id to (movie_id, person_id) one step closer to that side's root
+    source_parents = {source: None}
+    target_parents = {target: None}
 
-    while not frontier.empty():
-        current_node = frontier.remove()
+    # Distance of every discovered person from that side's root
+    source_depths = {source: 0}
+    target_depths = {target: 0}
 
-        # Checks if person_id is been visited before to prevent infinite loops/cycles
-        if current_node.state in visited:
-            continue
-        visited.add(current_node.state)
+    source_frontier = [source]
+    target_frontier = [target]
 
-        if current_node.state == target:
-            return get_path(current_node)
+    while source_frontier and target_frontier:
+        if len(source_frontier) <= len(target_frontier):
+            source_frontier, meeting = expand_level(
+                source_frontier, source_parents, source_depths, target_depths
+            )
+        else:
+            target_frontier, meeting = expand_level(
+                target_frontier, target_parents, target_depths, source_depths
+            )
 
-        for costar_movie_id, costar_person_id in neighbors_for_person(current_node.state):
-            frontier.add(Node(costar_person_id, current_node, costar_movie_id))
+        if meeting is not None:
+            return join_paths(meeting, source_parents, target_parents)
 
     return None
 
 
-def person_id_for_name(name):
+def expand_level(frontier, parents, depths, other_depths):
+    """
+    Expands every person in one BFS level, recording parents and depths.
+
+    Returns the next level and the meeting person with the smallest combined
+    depth across both searches, or None if the searches have not met yet.
+    """
+    next_frontier = []
+    meeting = None
+    best = None
+    for person_id in frontier:
+        for movie_id, costar_id in neighbors_for_person(person_id):
+            if costar_id in depths:
+                continue
+            parents[costar_id] = (movie_id, person_id)
+            depths[costar_id] = depths[person_id] + 1
+            next_frontier.append(costar_id)
+
+            # Keep scanning the level so the shortest meeting point wins
+            if costar_id in other_depths:
+                total = depths[costar_id] + other_depths[costar_id]
+                if best is None or total < best:
+                    best = total
+                    meeting = costar_id
+    return next_frontier, meeting
+
+
+def join_paths(meeting, source_parents, target_parents):
+    """
+    Stitches the source and target parent chains together at the meeting
+    person into a list of (movie_id, person_id) pairs from source to target.
+    """
+    path = path_from_parents(source_parents, meeting)
+
+    # Target side parents point one step closer to the target
+    person_id = meeting
+    while target_parents[person_id] is not None:
+        movie_id, next_id = target_parents[person_id]
+        path.append((movie_id, next_id))
+        person_id = next_id
+    return path
+
+
+def get_tree_cache():
+    """
+    Returns the shared BFSTreeCache, building a CSR graph from the loaded
+    dicts first when the "dict" backend is in use.
+    """
+    global tree_cache
+    if tree_cache is None:
+        source_graph = graph if graph is not None else Graph.from_dicts(people, movies)
+        tree_cache = BFSTreeCache(source_graph)
+    return tree_cache
+
+
+def separations(source, targets):
+    """
+    Returns a dict mapping each target person_id to its degrees of
+    separation from the source, or None if not connected.
+
+    One BFS from the source answers every target, and the BFS tree is
+    cached so later calls with the same source skip the search entirely.
+    """
+    return get_tree_cache().distances(source, targets)
+
+
+def person_id_for_name(name, interactive=True):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    When not interactive, ambiguous names return None instead of prompting.
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
+        if interactive:
+            suggest_names(name)
         return None
     elif len(person_ids) > 1:
+        if not interactive:
+            return None
         print(f"Which '{name}'?")
         for person_id in person_ids:
             person = people[person_id]
@@ -154,11 +409,27 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def suggest_names(name):
+    """
+    Prints the closest fuzzy matches for a name that has no exact match.
+    """
+    if name_index is None:
+        return
+    matches = name_index.fuzzy(name)
+    if matches:
+        print(f"No exact match for '{name}'. Did you mean:")
+        for _, _, person_id in matches:
+            person = people[person_id]
+            print(f"ID: {person_id}, Name: {person['name']}, Birth: {person['birth']}")
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return graph.neighbors_for_person(person_id)
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
@@ -0,0 +1,359 @@
+import threading
+from array import array
+from collections import OrderedDict
+from functools import cached_property
+
+# Typecode for every index array: 4-byte signed ints fit IMDB-sized data
+INDEX_TYPE = "i"
+
+# Default memory cap for BFSTreeCache, in bytes
+TREE_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class Graph():
+    """
+    Person <-> movie bipartite graph in compressed sparse row (CSR) form.
+
+    Person and movie IDs are interned to dense ints. The movies of person p
+    are person_movies[person_offsets[p]:person_offsets[p + 1]] and the stars
+    of movie m are movie_people[movie_offsets[m]:movie_offsets[m + 1]].
+    Searches walk those index ranges in place rather than slicing, so no
+    array is allocated per person or movie expanded.
+    """
+
+    def __init__(self, person_ids, movie_ids, person_offsets, person_movies,
+                 movie_offsets, movie_people):
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+
+    @cached_property
+    def person_index(self):
+        """Maps person_id to its dense index, built on first use."""
+        return {person_id: i for i, person_id in enumerate(self.person_ids)}
+
+    @cached_property
+    def movie_index(self):
+        """Maps movie_id to its dense index, built on first use."""
+        return {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+
+    @classmethod
+    def from_edges(cls, person_ids, movie_ids, edge_people, edge_movies):
+        """
+        Builds a graph from parallel arrays of person and movie indices,
+        one entry per (person, movie) starring edge.
+        """
+        person_offsets, person_movies = build_csr(
+            len(person_ids), edge_people, edge_movies
+        )
+        movie_offsets, movie_people = build_csr(
+            len(movie_ids), edge_movies, edge_people
+        )
+        return cls(person_ids, movie_ids, person_offsets, person_movies,
+                   movie_offsets, movie_people)
+
+    @classmethod
+    def from_dicts(cls, people, movies):
+        """
+        Builds a graph from the `people` and `movies` dicts of degrees.py.
+        """
+        person_ids = list(people)
+        movie_ids = list(movies)
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        edge_people = array(INDEX_TYPE)
+        edge_movies = array(INDEX_TYPE)
+        for i, person_id in enumerate(person_ids):
+            for movie_id in people[person_id]["movies"]:
+                edge_people.append(i)
+                edge_movies.append(movie_index[movie_id])
+        return cls.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+    def neighbors(self, person):
+        """
+        Yields (movie, person) index pairs for people who starred with the
+        person at index `person`, including the person themselves.
+        """
+        person_offsets = self.person_offsets
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+        person_movies = self.person_movies
+        for i in range(person_offsets[person], person_offsets[person + 1]):
+            movie = person_movies[i]
+            for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                yield movie, movie_people[j]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Yields (movie_id, person_id) pairs for people who starred with a
+        given person, mirroring degrees.neighbors_for_person.
+        """
+        person_ids = self.person_ids
+        movie_ids = self.movie_ids
+        for movie, costar in self.neighbors(self.person_index[person_id]):
+            yield movie_ids[movie], person_ids[costar]
+
+    def shortest_path(self, source, target, stats=None):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs that
+        connect the source to the target, or None if there is no path.
+
+        Runs BFS directly over the CSR index arrays, so no Node objects or
+        neighbor sets are built along the way. If a `stats` dict is given,
+        it receives the number of people expanded and the peak number of
+        people waiting in the current and next levels.
+        """
+        source = self.person_index[source]
+        target = self.person_index[target]
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        # Maps person index to the (movie, person) pair it was reached from
+        parents = {source: None}
+        frontier = [source]
+        expanded = 0
+        peak_frontier = 1
+
+        try:
+            if source == target:
+                return []
+            while frontier:
+                next_frontier = []
+                for position, person in enumerate(frontier):
+                    expanded += 1
+                    for i in range(person_offsets[person], person_offsets[person + 1]):
+                        movie = person_movies[i]
+                        for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                            costar = movie_people[j]
+                            if costar in parents:
+                                continue
+                            parents[costar] = (movie, person)
+                            if costar == target:
+                                return self.path_from_parents(parents, target)
+                            next_frontier.append(costar)
+                    waiting = len(frontier) - position - 1 + len(next_frontier)
+                    if waiting > peak_frontier:
+                        peak_frontier = waiting
+                frontier = next_frontier
+            return None
+        finally:
+            if stats is not None:
+                stats["expanded"] = expanded
+                stats["peak_frontier"] = peak_frontier
+
+    def bfs_tree(self, source):
+        """
+        Runs one full BFS from the person index `source` and returns a
+        BFSTree of parent and distance arrays over every person index.
+        """
+        people = len(self.person_ids)
+        parent_people = array(INDEX_TYPE, [-1]) * people
+        parent_movies = array(INDEX_TYPE, [-1]) * people
+        distances = array(INDEX_TYPE, [-1]) * people
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        distances[source] = 0
+        frontier = [source]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for person in frontier:
+                for i in range(person_offsets[person], person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                        costar = movie_people[j]
+                        if distances[costar] != -1:
+                            continue
+                        distances[costar] = distance
+                        parent_people[costar] = person
+                        parent_movies[costar] = movie
+                        next_frontier.append(costar)
+            frontier = next_frontier
+
+        return BFSTree(source, parent_people, parent_movies, distances)
+
+    def level_sizes(self, source):
+        """
+        Runs one full BFS from the person index `source` without keeping
+        parents and returns (sizes, farthest), where sizes[d] is the number
+        of people at distance d and farthest is a person at the last level.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        seen = bytearray(len(person_offsets) - 1)
+        seen[source] = 1
+        frontier = [source]
+        sizes = []
+        while frontier:
+            sizes.append(len(frontier))
+            farthest = frontier[0]
+            next_frontier = []
+            for person in frontier:
+                for i in range(person_offsets[person], person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                        costar = movie_people[j]
+                        if not seen[costar]:
+                            seen[costar] = 1
+                            next_frontier.append(costar)
+            frontier = next_frontier
+        return sizes, farthest
+
+    def path_from_parents(self, parents, target):
+        """
+        Follows `parents` back from the target index and returns the list of
+        (movie_id, person_id) pairs from the search root to the target.
+        """
+        path = []
+        person = target
+        while parents[person] is not None:
+            movie, previous = parents[person]
+            path.append((self.movie_ids[movie], self.person_ids[person]))
+            person = previous
+        path.reverse()
+        return path
+
+
+class BFSTree():
+    """
+    Result of one full BFS: for every person index, the person and movie it
+    was reached through and its distance from the source (-1 if unreachable).
+    """
+
+    def __init__(self, source, parent_people, parent_movies, distances):
+        self.source = source
+        self.parent_people = parent_people
+        self.parent_movies = parent_movies
+        self.distances = distances
+
+    def nbytes(self):
+        """Returns the memory held by the tree's arrays."""
+        return sum(len(a) * a.itemsize for a in
+                   (self.parent_people, self.parent_movies, self.distances))
+
+    def distance(self, target):
+        """Returns the distance to the target index, or None if unreachable."""
+        distance = self.distances[target]
+        return None if distance == -1 else distance
+
+    def path(self, graph, target):
+        """
+        Returns the list of (movie_id, person_id) pairs from the source to
+        the target index in O(path length), or None if unreachable.
+        """
+        if self.distances[target] == -1:
+            return None
+        path = []
+        person = target
+        while person != self.source:
+            path.append((graph.movie_ids[self.parent_movies[person]],
+                         graph.person_ids[person]))
+            person = self.parent_people[person]
+        path.reverse()
+        return path
+
+
+class BFSTreeCache():
+    """
+    LRU cache of BFSTree results keyed by source person index, evicting the
+    least recently used trees once their arrays exceed `max_bytes`.
+
+    Safe to share between threads; the BFS itself runs outside the lock.
+    """
+
+    def __init__(self, graph, max_bytes=TREE_CACHE_BYTES):
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def tree(self, source_id):
+        """
+        Returns the BFSTree for a source person_id, running the BFS on a miss.
+        """
+        source = self.graph.person_index[source_id]
+        with self.lock:
+            tree = self.trees.get(source)
+            if tree is not None:
+                self.trees.move_to_end(source)
+                self.hits += 1
+                return tree
+            self.misses += 1
+
+        tree = self.graph.bfs_tree(source)
+        with self.lock:
+            if source not in self.trees:
+                self.trees[source] = tree
+                self.nbytes += tree.nbytes()
+                self.evict()
+        return tree
+
+    def evict(self):
+        """Drops least recently used trees until under the memory cap."""
+        while self.nbytes > self.max_bytes and len(self.trees) > 1:
+            _, tree = self.trees.popitem(last=False)
+            self.nbytes -= tree.nbytes()
+
+    def path(self, source_id, target_id):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs from the
+        source to the target, or None if they are not connected.
+        """
+        tree = self.tree(source_id)
+        return tree.path(self.graph, self.graph.person_index[target_id])
+
+    def distances(self, source_id, target_ids):
+        """
+        Returns a dict of target person_id to degrees of separation from the
+        source, with None for targets that are not connected.
+        """
+        tree = self.tree(source_id)
+        person_index = self.graph.person_index
+        return {target_id: tree.distance(person_index[target_id])
+                for target_id in target_ids}
+
+    def stats(self):
+        """Returns hit, miss, size and memory counters for the cache."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "trees": len(self.trees),
+                "bytes": self.nbytes
+            }
+
+
+def build_csr(rows, edge_rows, edge_columns):
+    """
+    Counting-sorts edges by row and returns (offsets, columns) arrays where
+    the columns of row r are columns[offsets[r]:offsets[r + 1]].
+    """
+    offsets = array(INDEX_TYPE, [0]) * (rows + 1)
+    for row in edge_rows:
+        offsets[row + 1] += 1
+    for row in range(rows):
+        offsets[row + 1] += offsets[row]
+
+    # Fill each row from its start, tracking the next free slot per row
+    columns = array(INDEX_TYPE, [0]) * len(edge_rows)
+    cursor = offsets[:-1]
+    for row, column in zip(edge_rows, edge_columns):
+        columns[cursor[row]] = column
+        cursor[row] += 1
+    return offsets, columns
@@ -0,0 +1,226 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+# Default edit distance allowed by fuzzy lookups, and the most an index
+# is built to answer
+MAX_DISTANCE = 2
+
+# Default number of matches returned by a lookup
+LIMIT = 10
+
+# Characters per indexed segment of a key
+SEGMENT = 3
+
+
+class NameIndex():
+    """
+    Prefix and fuzzy lookup over the lowercase names of degrees.names.
+
+    Names are keyed by normalize(), the same as queries. Prefix search
+    bisects the sorted keys and walks forward from there. Fuzzy search is
+    a pigeonhole filter: every key is cut into short segments, and a name
+    within max_distance edits of the query keeps all but max_distance of
+    them intact, each only slightly shifted in the query. Segments are
+    indexed by key length, segment number and text, so the candidates are
+    the keys that share enough segments with nearby substrings of the
+    query. Only those are checked with a banded Levenshtein distance.
+    Matches are ranked by (distance, name, person_id), so ties always come
+    out in the same order.
+    """
+
+    def __init__(self, names, max_distance=MAX_DISTANCE):
+        # Names that only differ in whitespace share a key
+        self.names = {}
+        for name, person_ids in names.items():
+            key = normalize(name)
+            if key == name:
+                key = name
+            if key in self.names:
+                self.names[key] = self.names[key] | person_ids
+            else:
+                self.names[key] = person_ids
+        self.keys = sorted(self.names)
+        self.max_distance = max_distance
+
+        lengths = {}
+        for i, key in enumerate(self.keys):
+            lengths.setdefault(len(key), array("i")).append(i)
+
+        # Positions in self.keys of keys too short to cut, by length
+        self.short = {}
+        # For each key length, one dict per segment mapping the segment's
+        # text to the positions in self.keys of the keys that have it
+        self.segments = {}
+        keys = self.keys
+        for length, positions in lengths.items():
+            if length <= max_distance:
+                self.short[length] = positions
+                continue
+            self.segments[length] = []
+            for start, size in partition(length, max_distance):
+                segment = {}
+                for i in positions:
+                    text = keys[i][start:start + size]
+                    posting = segment.get(text)
+                    if posting is None:
+                        posting = segment[text] = array("i")
+                    posting.append(i)
+                self.segments[length].append(segment)
+
+    def prefix(self, prefix, limit=LIMIT):
+        """
+        Returns up to `limit` (name, person_id) pairs whose name starts with
+        `prefix`, in name then person_id order.
+        """
+        prefix = normalize(prefix)
+        keys = self.keys
+        matches = []
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[i]
+            if not key.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.extend((key, person_id) for person_id in sorted(self.names[key]))
+        return matches[:limit]
+
+    def fuzzy(self, name, max_distance=MAX_DISTANCE, limit=LIMIT):
+        """
+        Returns up to `limit` (distance, name, person_id) tuples for names
+        within `max_distance` edits of `name`, best matches first.
+        """
+        if max_distance > self.max_distance:
+            raise ValueError(f"index answers at most {self.max_distance} edits")
+        query = normalize(name)
+        matches = []
+        for i in self.candidates(query, max_distance):
+            key = self.keys[i]
+            distance = bounded_distance(query, key, max_distance)
+            if distance is not None:
+                matches.extend(
+                    (distance, key, person_id) for person_id in self.names[key]
+                )
+        matches.sort()
+        return matches[:limit]
+
+    def candidates(self, query, max_distance):
+        """
+        Returns positions in self.keys that could be within `max_distance`
+        edits of `query`.
+
+        An edit changes at most one segment of a key, however the key is
+        cut, so a match keeps all but `max_distance` of its segments intact.
+        Every intact segment appears in the query shifted by the edits
+        before it, and the edits after it make up the rest of the length
+        difference, which bounds the shift. Any max_distance + 1 indexed
+        segments then include an intact one, so keys are gathered from the
+        rarest of them, counted over all of them, and finally kept only if
+        they lose at most `max_distance` single characters.
+        """
+        keys = self.keys
+        candidates = []
+        for length in range(max(len(query) - max_distance, 0),
+                            len(query) + max_distance + 1):
+            if length <= self.max_distance:
+                candidates.extend(self.short.get(length, ()))
+                continue
+            if length not in self.segments:
+                continue
+
+            difference = len(query) - length
+            earliest = -((max_distance - difference) // 2)
+            latest = (max_distance + difference) // 2
+
+            def pieces(start, size):
+                return {query[offset:offset + size]
+                        for offset in range(max(start + earliest, 0),
+                                            min(start + latest, len(query) - size) + 1)}
+
+            # Postings of the keys sharing each indexed segment with the query
+            found = []
+            for segment, (start, size) in zip(self.segments[length],
+                                              partition(length, self.max_distance)):
+                found.append([segment[piece] for piece in pieces(start, size)
+                              if piece in segment])
+            found.sort(key=lambda postings: sum(map(len, postings)))
+
+            union = set()
+            for postings in found[:max_distance + 1]:
+                for posting in postings:
+                    union.update(posting)
+            hits = Counter()
+            for postings in found:
+                hits.update(union.intersection(chain(*postings)))
+            required = len(found) - max_distance
+
+            survivors = [i for i, count in hits.items() if count >= required]
+            if not survivors:
+                continue
+
+            characters = [(start, pieces(start, 1)) for start in range(length)]
+            for i in survivors:
+                key = keys[i]
+                misses = 0
+                for start, allowed in characters:
+                    if key[start] not in allowed:
+                        misses += 1
+                        if misses > max_distance:
+                            break
+                else:
+                    candidates.append(i)
+        return candidates
+
+
+def normalize(name):
+    """
+    Lowercases a name and collapses runs of whitespace.
+    """
+    return " ".join(name.lower().split())
+
+
+def partition(length, max_distance):
+    """
+    Returns the (start, size) of the segments a key of `length` characters
+    is cut into: about SEGMENT characters each, longer segments last, and
+    at least max_distance + 1 of them so one always survives.
+    """
+    parts = max(max_distance + 1, length // SEGMENT)
+    size, longer = divmod(length, parts)
+    segments = []
+    start = 0
+    for k in range(parts):
+        width = size + (k >= parts - longer)
+        segments.append((start, width))
+        start += width
+    return segments
+
+
+def bounded_distance(a, b, bound):
+    """
+    Returns the Levenshtein distance between `a` and `b` if it is at most
+    `bound`, otherwise None. Only a band of width 2 * bound + 1 around the
+    diagonal is filled in, and rows stop early once they all exceed bound.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return None
+    if a == b:
+        return 0
+
+    beyond = bound + 1
+    previous = [j if j <= bound else beyond for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [beyond] * (len(b) + 1)
+        if i <= bound:
+            current[0] = i
+        low = max(1, i - bound)
+        high = min(len(b), i + bound)
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + cost, beyond)
+        if min(current[low - 1:high + 1]) > bound:
+            return None
+        previous = current
+
+    distance = previous[len(b)]
+    return distance if distance <= bound else None
@@ -0,0 +1,273 @@
+import argparse
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import degrees
+
+# Default size of the worker pool answering queries. The pool is threads,
+# which overlap socket and stream I/O; the searches themselves hold the GIL,
+# so CPU-bound queries still run one at a time.
+WORKERS = 8
+
+# Query lines in flight ahead of the one being written, so stdin streams
+# stay bounded
+WINDOW = 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Answer many degrees queries against one loaded dataset."
+    )
+    parser.add_argument("--backend", default="csr",
+                        choices=["dict", "csr", "snapshot", "stream"])
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--bidirectional", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="read query pairs, write JSONL results"
+    )
+    batch.add_argument("directory")
+    batch.add_argument("queries", nargs="?", default="-",
+                       help="file of queries, or - for stdin")
+
+    serve = commands.add_parser("serve", help="run a local HTTP query server")
+    serve.add_argument("directory")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8050)
+
+    args = parser.parse_args()
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args.directory, args.backend)
+    print("Data loaded.", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        if args.command == "batch":
+            if args.queries == "-":
+                run_batch(sys.stdin, sys.stdout, pool, args.bidirectional)
+            else:
+                with open(args.queries, encoding="utf-8") as f:
+                    run_batch(f, sys.stdout, pool, args.bidirectional)
+        else:
+            server = QueryServer((args.host, args.port), pool, args.bidirectional)
+            print(f"Serving on http://{args.host}:{server.server_port}",
+                  file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+
+
+def parse_query(line):
+    """
+    Parses one query line into a (source, target) pair.
+
+    A line is either a JSON object with "source" and "target" keys or two
+    names (or person IDs) separated by a tab. Returns None for blank lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        query = json.loads(line)
+        return str(query["source"]), str(query["target"])
+    source, target = line.split("\t")
+    return source.strip(), target.strip()
+
+
+def resolve(value):
+    """
+    Returns (person_id, error) for a person ID or a name. Names that match
+    several people are reported as ambiguous rather than prompted for.
+
+    A name with no exact match falls back to the closest fuzzy match when
+    exactly one person is nearest, which absorbs small misspellings.
+    """
+    if value in degrees.people:
+        return value, None
+    person_id = degrees.person_id_for_name(value, interactive=False)
+    if person_id is not None:
+        return person_id, None
+    candidates = sorted(degrees.names.get(value.lower(), set()))
+    if candidates:
+        return None, f"ambiguous name {value!r}: {', '.join(candidates)}"
+
+    matches = degrees.name_index.fuzzy(value)
+    nearest = [person_id for distance, _, person_id in matches
+               if distance == matches[0][0]] if matches else []
+    if len(nearest) == 1:
+        return nearest[0], None
+    if nearest:
+        return None, f"ambiguous name {value!r}: {', '.join(nearest)}"
+    return None, f"person not found: {value!r}"
+
+
+def answer(source, target, bidirectional=False):
+    """
+    Answers one query and returns a JSON-serializable result dict.
+    """
+    result = {"source": source, "target": target}
+    source_id, error = resolve(source)
+    if error is None:
+        target_id, error = resolve(target)
+    if error is not None:
+        result["error"] = error
+        return result
+
+    if bidirectional:
+        path = degrees.bidirectional_shortest_path(source_id, target_id)
+    else:
+        path = degrees.shortest_path(source_id, target_id)
+
+    result["source_id"] = source_id
+    result["target_id"] = target_id
+    if path is None:
+        result["degrees"] = None
+        result["path"] = None
+    else:
+        result["degrees"] = len(path)
+        result["path"] = [
+            {
+                "movie_id": movie_id,
+                "movie": degrees.movies[movie_id]["title"],
+                "person_id": person_id,
+                "person": degrees.people[person_id]["name"]
+            }
+            for movie_id, person_id in path
+        ]
+    return result
+
+
+def answer_line(line, bidirectional=False):
+    """
+    Parses and answers one query line, turning malformed input into an
+    error result instead of an exception.
+    """
+    try:
+        query = parse_query(line)
+    except (ValueError, KeyError) as e:
+        return {"query": line.rstrip("\n"), "error": f"malformed query: {e}"}
+    if query is None:
+        return None
+    return answer(*query, bidirectional)
+
+
+def run_batch(lines, out, pool, bidirectional=False):
+    """
+    Answers every query line from `lines` on the worker pool and writes one
+    JSON result per line to `out`, in input order.
+
+    Each line goes to the pool as soon as it is read, and a writer thread
+    emits results in order as they finish, so an interactive or slow
+    stream is answered line by line. At most WINDOW lines are in flight.
+    """
+    pending = queue.Queue(maxsize=WINDOW)
+    errors = []
+
+    def write_results():
+        while True:
+            future = pending.get()
+            if future is None:
+                return
+            if errors:
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            if result is not None:
+                out.write(json.dumps(result) + "\n")
+            if pending.empty():
+                out.flush()
+
+    writer = threading.Thread(target=write_results)
+    writer.start()
+    try:
+        for line in lines:
+            if errors:
+                break
+            pending.put(pool.submit(answer_line, line, bidirectional))
+    finally:
+        pending.put(None)
+        writer.join()
+    out.flush()
+    if errors:
+        raise errors[0]
+
+
+class QueryServer(HTTPServer):
+    """
+    HTTP server that keeps the dataset resident and hands each request to
+    a shared worker pool.
+
+    GET /path?source=...&target=... answers one query. POST /batch takes a
+    body of query lines and returns JSONL results.
+    """
+
+    def __init__(self, address, pool, bidirectional=False):
+        super().__init__(address, QueryHandler)
+        self.pool = pool
+        self.bidirectional = bidirectional
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/path":
+            self.send_error(404)
+            return
+        params = parse_qs(url.query)
+        if "source" not in params or "target" not in params:
+            self.send_error(400, "source and target are required")
+            return
+        result = answer(params["source"][0], params["target"][0],
+                        self.server.bidirectional)
+        self.send_body(json.dumps(result) + "\n")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/batch":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        lines = self.rfile.read(length).decode("utf-8").splitlines()
+        results = [answer_line(line, self.server.bidirectional) for line in lines]
+        self.send_body("".join(
+            json.dumps(result) + "\n" for result in results if result is not None
+        ))
+
+    def send_body(self, body):
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep stderr for load progress rather than one line per request
+        pass
+
+
+if __name__ == "__main__":
+    main()
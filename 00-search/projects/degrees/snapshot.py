@@ -0,0 +1,154 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from graph import Graph, INDEX_TYPE
+
+# Bump whenever the on-disk layout changes so stale snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = "degrees.snapshot"
+MAGIC = b"DEGSNAP\0"
+
+# Magic, then the little-endian byte length of the JSON header
+PREAMBLE = struct.Struct("<8sQ")
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_people")
+ALIGNMENT = 8
+
+
+def snapshot_path(directory):
+    """
+    Returns the path of the snapshot file for a data directory.
+    """
+    return os.path.join(directory, SNAPSHOT_NAME)
+
+
+def source_stamps(directory):
+    """
+    Returns the [mtime_ns, size] of every CSV file the snapshot is built
+    from, which together decide whether a snapshot is still fresh.
+    """
+    stamps = {}
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps[name] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def save_snapshot(directory, graph, people, movies):
+    """
+    Writes the CSR arrays of `graph` plus the display fields of `people`
+    and `movies` to the snapshot file of `directory`.
+
+    The file is written under a temporary name and renamed into place, so
+    a concurrent reader never sees a half-written snapshot.
+    """
+    tables = {
+        "person_ids": graph.person_ids,
+        "names": [people[person_id]["name"] for person_id in graph.person_ids],
+        "births": [people[person_id]["birth"] for person_id in graph.person_ids],
+        "movie_ids": graph.movie_ids,
+        "titles": [movies[movie_id]["title"] for movie_id in graph.movie_ids],
+        "years": [movies[movie_id]["year"] for movie_id in graph.movie_ids]
+    }
+    blobs = [array(INDEX_TYPE, getattr(graph, name)).tobytes() for name in ARRAYS]
+    blobs.append(json.dumps(tables).encode("utf-8"))
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "itemsize": array(INDEX_TYPE).itemsize,
+        "sources": source_stamps(directory),
+        "sections": []
+    }
+
+    # Section offsets depend on the header length, so lay out against a
+    # header padded to a fixed size
+    header_size = align(len(json.dumps(header)) + 64 * (len(blobs) + 1))
+    offset = PREAMBLE.size + header_size
+    for blob in blobs:
+        header["sections"].append([offset, len(blob)])
+        offset = align(offset + len(blob))
+    encoded = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    path = snapshot_path(directory)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, header_size))
+        f.write(encoded)
+        for (start, _), blob in zip(header["sections"], blobs):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(blob)
+    os.replace(temporary, path)
+
+
+def load_snapshot(directory, tables=True):
+    """
+    Memory-maps the snapshot of `directory` and returns (graph, tables), or
+    None if there is no snapshot or it is stale, corrupt or from another
+    format version.
+
+    The graph's CSR arrays are memoryviews straight into the mapped file.
+    With `tables` False the ID and display tables are not decoded: the
+    graph's person and movie IDs are then just their indices and tables is
+    None, which keeps loading in worker processes cheap.
+    """
+    path = snapshot_path(directory)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+    header = read_header(mapped)
+    if (header is None
+            or header.get("version") != SNAPSHOT_VERSION
+            or header.get("byteorder") != sys.byteorder
+            or header.get("itemsize") != array(INDEX_TYPE).itemsize
+            or header.get("sources") != source_stamps(directory)
+            or len(header.get("sections", [])) != len(ARRAYS) + 1):
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    sections = [view[start:start + length] for start, length in header["sections"]]
+    arrays = [section.cast(INDEX_TYPE) for section in sections[:-1]]
+    if not tables:
+        person_offsets, _, movie_offsets, _ = arrays
+        graph = Graph(range(len(person_offsets) - 1),
+                      range(len(movie_offsets) - 1), *arrays)
+        return graph, None
+
+    tables = json.loads(bytes(sections[-1]).decode("utf-8"))
+    graph = Graph(tables["person_ids"], tables["movie_ids"], *arrays)
+    return graph, tables
+
+
+def read_header(mapped):
+    """
+    Returns the decoded JSON header of a mapped snapshot, or None if the
+    file does not start with a valid preamble.
+    """
+    if len(mapped) < PREAMBLE.size:
+        return None
+    magic, header_size = PREAMBLE.unpack_from(mapped)
+    if magic != MAGIC or PREAMBLE.size + header_size > len(mapped):
+        return None
+    try:
+        return json.loads(mapped[PREAMBLE.size:PREAMBLE.size + header_size])
+    except ValueError:
+        return None
+
+
+def align(offset):
+    """
+    Rounds `offset` up to the next multiple of ALIGNMENT.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
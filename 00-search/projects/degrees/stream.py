@@ -0,0 +1,111 @@
+import csv
+from array import array
+from collections.abc import Mapping
+
+from graph import Graph, INDEX_TYPE
+
+# Bytes of CSV read and parsed per chunk
+CHUNK_BYTES = 1 << 20
+
+
+def load_stream(directory):
+    """
+    Streams the three CSV files of `directory` in chunks and keeps only
+    what search and name lookup need. Returns (graph, names, people, movies).
+
+    `names` maps lowercase names to sets of person_ids as usual, but
+    `people` and `movies` are LazyRecords that read name, birth, title and
+    year back from the CSV files through a byte offset per row.
+    """
+    person_ids, person_offsets = [], array("q")
+    names = {}
+    for offset, row in read_chunks(f"{directory}/people.csv"):
+        person_id, name = row[0], row[1]
+        person_ids.append(person_id)
+        person_offsets.append(offset)
+        names.setdefault(name.lower(), set()).add(person_id)
+
+    movie_ids, movie_offsets = [], array("q")
+    for offset, row in read_chunks(f"{directory}/movies.csv"):
+        movie_ids.append(row[0])
+        movie_offsets.append(offset)
+
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    edge_people = array(INDEX_TYPE)
+    edge_movies = array(INDEX_TYPE)
+    for _, row in read_chunks(f"{directory}/stars.csv"):
+        try:
+            person = person_index[row[0]]
+            movie = movie_index[row[1]]
+        except KeyError:
+            continue
+        edge_people.append(person)
+        edge_movies.append(movie)
+
+    graph = Graph.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+    # Hand over the indices already built rather than letting the graph
+    # build its own copies on first use
+    graph.person_index = person_index
+    graph.movie_index = movie_index
+
+    people = LazyRecords(f"{directory}/people.csv", person_ids, person_index,
+                         person_offsets, ("name", "birth"))
+    movies = LazyRecords(f"{directory}/movies.csv", movie_ids, movie_index,
+                         movie_offsets, ("title", "year"))
+    return graph, names, people, movies
+
+
+def read_chunks(filename):
+    """
+    Yields (byte offset, row) for every data row of a CSV file, reading and
+    parsing about CHUNK_BYTES at a time.
+
+    Offsets are counted per line, so quoted fields must not span lines,
+    which holds for the IMDB CSV files.
+    """
+    with open(filename, "rb") as f:
+        offset = len(f.readline())
+        while True:
+            lines = f.readlines(CHUNK_BYTES)
+            if not lines:
+                break
+            rows = csv.reader(line.decode("utf-8") for line in lines)
+            for line, row in zip(lines, rows):
+                if row:
+                    yield offset, row
+                offset += len(line)
+
+
+class LazyRecords(Mapping):
+    """
+    Read-only mapping of ID to a dict of display fields that seeks to the
+    row's byte offset in its CSV file on each lookup instead of holding
+    every row in memory.
+    """
+
+    def __init__(self, filename, ids, index, offsets, fields):
+        self.filename = filename
+        self.ids = ids
+        self.index = index
+        self.offsets = offsets
+        self.fields = fields
+
+    def __getitem__(self, key):
+        offset = self.offsets[self.index[key]]
+        with open(self.filename, "rb") as f:
+            f.seek(offset)
+            line = f.readline().decode("utf-8")
+        row = next(csv.reader([line]))
+        return dict(zip(self.fields, row[1:]))
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
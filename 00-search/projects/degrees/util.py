@@ -1,19 +1,29 @@
+import heapq
+import itertools
+from collections import deque
+
+
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 class StackFrontier():
     def __init__(self):
         self.frontier = []
 
+        # Number of nodes in the frontier per state, for O(1) contains_state
+        self.states = {}
+
     def add(self, node):
         self.frontier.append(node)
+        self.track(node)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,17 +32,56 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.untrack(node)
             return node
 
+    def track(self, node):
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def untrack(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+
 
 class QueueFrontier(StackFrontier):
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()
+            self.untrack(node)
+            return node
+
+
+class PriorityFrontier(StackFrontier):
+    """
+    Binary heap frontier that removes the node with the lowest priority
+    first, for uniform-cost search (priority = node.cost) or A*
+    (priority = node.cost + heuristic). Ties leave in insertion order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.counter = itertools.count()
+
+    def add(self, node, priority=None):
+        if priority is None:
+            priority = node.cost
+        heapq.heappush(self.frontier, (priority, next(self.counter), node))
+        self.track(node)
 
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            _, _, node = heapq.heappop(self.frontier)
+            self.untrack(node)
             return node
@@ -0,0 +1,121 @@
+import math
+import os
+import sys
+import time
+
+import bitboard
+import mnk
+import parallel
+import tictactoe as ttt
+
+# Board and depth of the root-parallel scaling benchmark
+PARALLEL_GAME = (4, 4, 4)
+PARALLEL_DEPTH = 8
+
+
+def main():
+    if len(sys.argv) != 2 or sys.argv[1] not in BENCHMARKS:
+        sys.exit(f"Usage: python benchmark.py {'|'.join(BENCHMARKS)}")
+    BENCHMARKS[sys.argv[1]]()
+
+
+def benchmark_bitboard():
+    """
+    Times the full-tree minimax search from the empty board on the
+    list-of-lists board and on bitboards.
+    """
+    engines = [
+        ("list board", lambda board: full_minimax(board, {})[1], ttt.initial_state()),
+        ("bitboard", bitboard.minimax, bitboard.initial_state())
+    ]
+    print("Full-tree minimax from the empty board")
+    for name, minimax, board in engines:
+        start = time.perf_counter()
+        move = minimax(board)
+        elapsed = time.perf_counter() - start
+        print(f"  {name}: move {move}, {elapsed:.3f}s")
+
+
+def benchmark_alphabeta():
+    """
+    Plays one game of alpha-beta against itself and reports, for every
+    move, the nodes visited and latency of the original full-tree minimax
+    and of alpha-beta, checking that both choose a move of the same value.
+    """
+    board = ttt.initial_state()
+    print("Move  full nodes  full time  alpha-beta nodes  alpha-beta time")
+    while not ttt.terminal(board):
+        full_stats = {}
+        start = time.perf_counter()
+        value, _ = full_minimax(board, full_stats)
+        full_time = time.perf_counter() - start
+
+        stats = {}
+        start = time.perf_counter()
+        move = ttt.minimax(board, stats, use_book=False)
+        elapsed = time.perf_counter() - start
+
+        board = ttt.result(board, move)
+        if full_minimax(board, {})[0] != value:
+            sys.exit(f"Alpha-beta chose {move}, which is not optimal.")
+        print(f"{str(move):>6}  {full_stats['nodes']:>10}  {full_time:>8.4f}s"
+              f"  {stats['nodes']:>16}  {elapsed:>14.4f}s")
+
+
+def full_minimax(board, stats):
+    """
+    The original tictactoe.minimax without pruning, kept as a baseline.
+    Returns (value, action) and counts nodes visited in `stats`.
+    """
+    stats["nodes"] = stats.get("nodes", 0) + 1
+    if ttt.terminal(board):
+        return (ttt.utility(board), None)
+
+    maximizing = ttt.player(board) == ttt.X
+    value = -math.inf if maximizing else math.inf
+    optimal_action = None
+    for action in ttt.actions(board):
+        child_value = full_minimax(ttt.result(board, action), stats)[0]
+        if (maximizing and child_value > value) or (not maximizing and child_value < value):
+            value = child_value
+            optimal_action = action
+    return (value, optimal_action)
+
+
+def benchmark_parallel():
+    """
+    Times a fixed-depth root-parallel search with 1 to N workers against
+    serial alpha-beta and checks that every run picks the serial move.
+    """
+    game = mnk.Game(*PARALLEL_GAME)
+    board = game.initial_state()
+
+    stats = {}
+    start = time.perf_counter()
+    move = parallel.serial_minimax(board, game, PARALLEL_DEPTH, stats)
+    serial_time = time.perf_counter() - start
+    print(f"{PARALLEL_GAME} game, depth {PARALLEL_DEPTH}")
+    print(f"  serial: move {move}, {stats['nodes']} nodes, {serial_time:.3f}s")
+
+    workers = 1
+    while workers <= os.cpu_count():
+        stats = {}
+        start = time.perf_counter()
+        parallel_move = parallel.minimax(board, workers, game, PARALLEL_DEPTH, stats)
+        elapsed = time.perf_counter() - start
+        if parallel_move != move:
+            sys.exit(f"{workers} workers chose {parallel_move}, serial chose {move}.")
+        print(f"  {workers} workers: {stats['nodes']} nodes, {elapsed:.3f}s, "
+              f"{serial_time / elapsed:.2f}x")
+        workers *= 2
+
+
+BENCHMARKS = {
+    "alphabeta": benchmark_alphabeta,
+    "bitboard": benchmark_bitboard,
+    "parallel": benchmark_parallel
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Tic Tac Toe on bitboards
+
+A position is a pair (x, o) of 9-bit integers where bit 3 * i + j is set
+when that player has a mark at row i, column j. Moves are a single OR, wins
+are checked against precomputed line masks, and the player to move comes
+from comparing popcounts, so no board is ever copied or rescanned.
+"""
+
+from tictactoe import X, O, EMPTY
+
+FULL = 0b111111111
+
+# Masks of the three rows, three columns and two diagonals
+LINES = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+)
+
+# Cell order used to generate moves
+CELLS = tuple(range(9))
+
+
+def initial_state():
+    """
+    Returns the empty position.
+    """
+    return (0, 0)
+
+
+def from_board(board):
+    """
+    Converts a list-of-lists board from tictactoe.py into a position.
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == X:
+                x |= 1 << (3 * i + j)
+            elif cell == O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(position):
+    """
+    Converts a position back into a list-of-lists board.
+    """
+    x, o = position
+    board = []
+    for i in range(3):
+        row = []
+        for j in range(3):
+            bit = 1 << (3 * i + j)
+            row.append(X if x & bit else O if o & bit else EMPTY)
+        board.append(row)
+    return board
+
+
+def player(position):
+    """
+    Returns player who has the next turn in a position.
+    """
+    x, o = position
+    return X if x.bit_count() == o.bit_count() else O
+
+
+def actions(position):
+    """
+    Returns set of all possible actions (i, j) available in a position.
+    """
+    x, o = position
+    occupied = x | o
+    return {divmod(cell, 3) for cell in CELLS if not occupied >> cell & 1}
+
+
+def result(position, action):
+    """
+    Returns the position that results from making move (i, j).
+    """
+    i, j = action
+    if not (0 <= i <= 2 and 0 <= j <= 2):
+        raise Exception("Sorry, action has coordinated that are out of bounds.")
+    x, o = position
+    bit = 1 << (3 * i + j)
+    if (x | o) & bit:
+        raise Exception("Sorry, a move was already placed here.")
+    return (x | bit, o) if x.bit_count() == o.bit_count() else (x, o | bit)
+
+
+def has_line(bits):
+    """
+    Returns True if the marks in `bits` complete any line.
+    """
+    for line in LINES:
+        if bits & line == line:
+            return True
+    return False
+
+
+def winner(position):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = position
+    if has_line(x):
+        return X
+    if has_line(o):
+        return O
+    return None
+
+
+def terminal(position):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = position
+    return (x | o) == FULL or has_line(x) or has_line(o)
+
+
+def utility(position):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = position
+    if has_line(x):
+        return 1
+    if has_line(o):
+        return -1
+    return 0
+
+
+def minimax(position, stats=None):
+    """
+    Returns the optimal action (i, j) for the player to move, searching the
+    full game tree like tictactoe.minimax. Ties go to the lowest cell.
+    If a `stats` dict is given, it receives the number of nodes visited.
+    """
+    if terminal(position):
+        return None
+    x, o = position
+    counter = [0] if stats is not None else None
+    value, cell = search(x, o, x.bit_count() == o.bit_count(), counter)
+    if stats is not None:
+        stats["nodes"] = counter[0]
+    return divmod(cell, 3)
+
+
+def search(x, o, x_to_move, counter=None):
+    """
+    Returns (value, cell) of the best move from a non-terminal position,
+    where value is from X's point of view. Nodes searched are added to
+    counter[0] when a counter list is given.
+    """
+    if counter is not None:
+        counter[0] += 1
+    occupied = x | o
+    best_value = None
+    best_cell = None
+    for cell in CELLS:
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+
+        if x_to_move:
+            child_x, child_o = x | bit, o
+            won = has_line(child_x)
+        else:
+            child_x, child_o = x, o | bit
+            won = has_line(child_o)
+
+        if won:
+            value = 1 if x_to_move else -1
+        elif occupied | bit == FULL:
+            value = 0
+        else:
+            value = search(child_x, child_o, not x_to_move, counter)[0]
+
+        if (best_value is None
+                or (x_to_move and value > best_value)
+                or (not x_to_move and value < best_value)):
+            best_value = value
+            best_cell = cell
+    return best_value, best_cell
@@ -0,0 +1,197 @@
+"""
+Tic Tac Toe perfect-play book
+
+Every position reachable from the empty board is solved once and written
+to a table with one byte per base-3 board index (3^9 entries). A byte
+holds the value of the position plus one in bits 4-5 and its best cell in
+bits 0-3, or UNREACHABLE. Looking up a move is then a single byte read
+from a memory-mapped file.
+"""
+
+import mmap
+import os
+import sys
+
+import bitboard
+import tictactoe as ttt
+
+BOOK_FILE = "book.bin"
+MAGIC = b"TTTBOOK1"
+ENTRIES = 3 ** 9
+UNREACHABLE = 0xFF
+NO_CELL = 0x0F
+
+# Base-3 weight of each cell in a board index
+WEIGHTS = tuple(3 ** cell for cell in range(9))
+
+
+def index(x, o):
+    """
+    Returns the base-3 index of a position: digit 1 for X, 2 for O.
+    """
+    total = 0
+    for cell in range(9):
+        if x >> cell & 1:
+            total += WEIGHTS[cell]
+        elif o >> cell & 1:
+            total += 2 * WEIGHTS[cell]
+    return total
+
+
+def solve():
+    """
+    Solves every reachable position and returns the table as a bytearray.
+    Best moves are the first optimal move in tictactoe.MOVE_ORDER.
+    """
+    table = bytearray([UNREACHABLE]) * ENTRIES
+    order = [3 * i + j for i, j in ttt.MOVE_ORDER]
+
+    def value(x, o):
+        entry = table[index(x, o)]
+        if entry != UNREACHABLE:
+            return (entry >> 4) - 1
+
+        if bitboard.terminal((x, o)):
+            best_value, best_cell = bitboard.utility((x, o)), NO_CELL
+        else:
+            x_to_move = x.bit_count() == o.bit_count()
+            best_value, best_cell = None, NO_CELL
+            for cell in order:
+                bit = 1 << cell
+                if (x | o) & bit:
+                    continue
+                child = value(x | bit, o) if x_to_move else value(x, o | bit)
+                if (best_value is None
+                        or (x_to_move and child > best_value)
+                        or (not x_to_move and child < best_value)):
+                    best_value, best_cell = child, cell
+
+        table[index(x, o)] = (best_value + 1) << 4 | best_cell
+        return best_value
+
+    value(0, 0)
+    return table
+
+
+def build(path=BOOK_FILE):
+    """
+    Solves the game and writes the book to `path`.
+    """
+    table = solve()
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(table)
+    os.replace(temporary, path)
+
+
+class Book():
+    """
+    Read-only view of a book file, memory-mapped so lookups cost one byte.
+    """
+
+    def __init__(self, path=BOOK_FILE):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) != len(MAGIC) + ENTRIES or self.data[:len(MAGIC)] != MAGIC:
+            self.data.close()
+            raise ValueError(f"{path} is not a tic-tac-toe book")
+
+    def entry(self, position):
+        """
+        Returns the raw byte stored for a bitboard position.
+        """
+        return self.data[len(MAGIC) + index(*position)]
+
+    def lookup(self, board):
+        """
+        Returns (value, action) for a list-of-lists board, where action is
+        None for terminal boards. Raises ValueError for unreachable boards.
+        """
+        entry = self.entry(bitboard.from_board(board))
+        if entry == UNREACHABLE:
+            raise ValueError("board is not reachable from the initial state")
+        cell = entry & NO_CELL
+        return (entry >> 4) - 1, None if cell == NO_CELL else divmod(cell, 3)
+
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board, like
+        tictactoe.minimax, in constant time.
+        """
+        return self.lookup(board)[1]
+
+
+def load_or_build(path=BOOK_FILE):
+    """
+    Returns the Book at `path`, building it first if it is missing or
+    not a valid book.
+    """
+    try:
+        return Book(path)
+    except (FileNotFoundError, ValueError):
+        build(path)
+        return Book(path)
+
+
+def verify(path=BOOK_FILE):
+    """
+    Checks every reachable position against exhaustive minimax on
+    tictactoe.py boards: the stored value must equal the minimax value and
+    the stored move must lead to a position of that same value.
+
+    Returns the number of positions checked.
+    """
+    book = Book(path)
+    values = {}
+
+    def value(board):
+        key = str(board)
+        if key not in values:
+            if ttt.terminal(board):
+                values[key] = ttt.utility(board)
+            else:
+                children = [value(ttt.result(board, action)) for action in ttt.actions(board)]
+                values[key] = max(children) if ttt.player(board) == ttt.X else min(children)
+        return values[key]
+
+    checked = 0
+    pending = [ttt.initial_state()]
+    seen = set()
+    while pending:
+        board = pending.pop()
+        if str(board) in seen:
+            continue
+        seen.add(str(board))
+        checked += 1
+
+        stored_value, action = book.lookup(board)
+        if stored_value != value(board):
+            raise AssertionError(f"wrong value {stored_value} for {board}")
+        if ttt.terminal(board):
+            if action is not None:
+                raise AssertionError(f"move {action} stored for terminal {board}")
+            continue
+        if value(ttt.result(board, action)) != stored_value:
+            raise AssertionError(f"suboptimal move {action} for {board}")
+        pending.extend(ttt.result(board, action) for action in ttt.actions(board))
+
+    # Every other index must be marked unreachable
+    if sum(byte != UNREACHABLE for byte in book.data[len(MAGIC):]) != checked:
+        raise AssertionError("book has entries for unreachable positions")
+    return checked
+
+
+def main():
+    if len(sys.argv) not in (2, 3) or sys.argv[1] not in ("build", "verify"):
+        sys.exit("Usage: python book.py build|verify [file]")
+    path = sys.argv[2] if len(sys.argv) == 3 else BOOK_FILE
+    if sys.argv[1] == "build":
+        build(path)
+        print(f"Wrote {path}.")
+    else:
+        print(f"{verify(path)} positions agree with minimax.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Tic Tac Toe engine harness
+
+Plays self-play tournaments between engine configurations and counts
+perft leaf nodes, without a display.
+
+Engines are deterministic, so games start from random drawn openings of
+OPENING_PLIES moves to cover more positions. Since every engine plays
+perfectly, every game must end in a draw, whoever plays whom. The harness
+reports nodes per second and the mean and 99th percentile move latency of
+each engine, and exits with an error if any game is not a draw or any
+perft count is wrong.
+"""
+
+import math
+import random
+import sys
+import time
+
+import benchmark
+import bitboard
+import book
+import tictactoe as ttt
+from transposition import TranspositionTable
+
+GAMES = 100
+OPENING_PLIES = 2
+SEED = 0
+
+# Leaf positions at each depth from the empty board, finished games
+# included and not expanded further
+PERFT = (1, 9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872)
+
+
+def engines():
+    """
+    Returns the engine configurations by name. Each engine takes a board
+    and a stats dict, records the nodes it visits and returns its move.
+    """
+    table = TranspositionTable()
+
+    def plain(board, stats):
+        return benchmark.full_minimax(board, stats)[1]
+
+    def alphabeta(board, stats):
+        return ttt.minimax(board, stats, use_book=False)
+
+    def transposition(board, stats):
+        probes = table.probes
+        move = table.minimax(board)
+        stats["nodes"] = table.probes - probes
+        return move
+
+    def bits(board, stats):
+        return bitboard.minimax(bitboard.from_board(board), stats)
+
+    return {
+        "minimax": plain,
+        "alphabeta": alphabeta,
+        "transposition": transposition,
+        "bitboard": bits
+    }
+
+
+def openings(plies):
+    """
+    Returns every board reachable in `plies` moves whose game-theoretic
+    value is a draw, according to a freshly solved book.
+    """
+    table = book.solve()
+    boards = [ttt.initial_state()]
+    for _ in range(plies):
+        boards = [ttt.result(board, action)
+                  for board in boards if not ttt.terminal(board)
+                  for action in sorted(ttt.actions(board))]
+    return [board for board in boards
+            if table[book.index(*bitboard.from_board(board))] >> 4 == 1]
+
+
+def play(board, x_engine, o_engine, timings):
+    """
+    Plays a game from `board` and returns its winner, or None for a draw.
+    Appends (nodes, seconds) for each move to timings[engine].
+    """
+    players = {ttt.X: x_engine, ttt.O: o_engine}
+    while not ttt.terminal(board):
+        engine = players[ttt.player(board)]
+        stats = {}
+        start = time.perf_counter()
+        move = ENGINES[engine](board, stats)
+        timings[engine].append((stats["nodes"], time.perf_counter() - start))
+        board = ttt.result(board, move)
+    return ttt.winner(board)
+
+
+def percentile(values, fraction):
+    """
+    Returns the smallest value at least `fraction` of `values` do not exceed.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def tournament(games):
+    """
+    Plays `games` games for every ordered pair of engines, itself included,
+    prints the results and per-engine throughput and returns the number of
+    games that were not draws.
+    """
+    rng = random.Random(SEED)
+    starts = openings(OPENING_PLIES)
+    timings = {engine: [] for engine in ENGINES}
+    decisive = 0
+
+    print(f"{games} games per pairing from {len(starts)} drawn openings")
+    print(f"{'X':>13} {'O':>13}  draws  X wins  O wins")
+    for x_engine in ENGINES:
+        for o_engine in ENGINES:
+            results = {None: 0, ttt.X: 0, ttt.O: 0}
+            for _ in range(games):
+                results[play(rng.choice(starts), x_engine, o_engine, timings)] += 1
+            decisive += results[ttt.X] + results[ttt.O]
+            print(f"{x_engine:>13} {o_engine:>13}  {results[None]:>5}"
+                  f"  {results[ttt.X]:>6}  {results[ttt.O]:>6}")
+
+    print()
+    print(f"{'engine':>13}  {'moves':>6}  {'nodes/s':>10}  {'mean':>9}  {'p99':>9}")
+    for engine, moves in timings.items():
+        nodes = sum(count for count, _ in moves)
+        seconds = [elapsed for _, elapsed in moves]
+        total = sum(seconds)
+        print(f"{engine:>13}  {len(moves):>6}  {nodes / total:>10,.0f}"
+              f"  {1000 * total / len(moves):>7.3f}ms"
+              f"  {1000 * percentile(seconds, 0.99):>7.3f}ms")
+    return decisive
+
+
+def perft_board(board, depth):
+    """
+    Returns the number of positions `depth` moves after a list-of-lists
+    board, not expanding finished games.
+    """
+    if depth == 0 or ttt.terminal(board):
+        return 1 if depth == 0 else 0
+    return sum(perft_board(ttt.result(board, action), depth - 1)
+               for action in ttt.actions(board))
+
+
+def perft_bits(x, o, depth):
+    """
+    Returns the number of positions `depth` moves after a bitboard
+    position, not expanding finished games.
+    """
+    if depth == 0:
+        return 1
+    if bitboard.has_line(x) or bitboard.has_line(o) or (x | o) == bitboard.FULL:
+        return 0
+    x_to_move = x.bit_count() == o.bit_count()
+    total = 0
+    for cell in bitboard.CELLS:
+        bit = 1 << cell
+        if (x | o) & bit:
+            continue
+        if x_to_move:
+            total += perft_bits(x | bit, o, depth - 1)
+        else:
+            total += perft_bits(x, o | bit, depth - 1)
+    return total
+
+
+def perft(max_depth):
+    """
+    Counts leaf positions at every depth up to `max_depth` on both board
+    representations, prints counts and rates and returns the number of
+    counts that disagree with PERFT.
+    """
+    backends = [
+        ("list board", lambda depth: perft_board(ttt.initial_state(), depth)),
+        ("bitboard", lambda depth: perft_bits(0, 0, depth))
+    ]
+    wrong = 0
+    print(f"{'depth':>5}  {'backend':>10}  {'leaves':>7}  {'time':>8}  {'leaves/s':>10}")
+    for depth in range(1, max_depth + 1):
+        for name, count in backends:
+            start = time.perf_counter()
+            leaves = count(depth)
+            elapsed = time.perf_counter() - start
+            mark = "" if leaves == PERFT[depth] else f"  expected {PERFT[depth]}"
+            wrong += bool(mark)
+            print(f"{depth:>5}  {name:>10}  {leaves:>7}  {elapsed:>7.3f}s"
+                  f"  {leaves / elapsed:>10,.0f}{mark}")
+    return wrong
+
+
+ENGINES = engines()
+
+
+def main():
+    if len(sys.argv) not in (2, 3) or sys.argv[1] not in ("tournament", "perft"):
+        sys.exit("Usage: python harness.py tournament [games] | perft [depth]")
+    if sys.argv[1] == "tournament":
+        games = int(sys.argv[2]) if len(sys.argv) == 3 else GAMES
+        if tournament(games):
+            sys.exit("Some games were not draws.")
+    else:
+        depth = int(sys.argv[2]) if len(sys.argv) == 3 else len(PERFT) - 1
+        if perft(depth):
+            sys.exit("Some perft counts are wrong.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+m,n,k-game player
+
+Generalizes tictactoe.py to an m x n board where k in a row wins, so the
+same engine plays 3,3,3 (tic-tac-toe), 4,4,4 or Gomoku-style 15,15,5.
+Positions are searched as bitboards with iterative-deepening alpha-beta
+under an optional time budget, a window-counting heuristic at the depth
+limit, and win detection that only looks along the lines through the last
+move. The module-level functions play the 3,3,3 game with the same API as
+tictactoe.py.
+"""
+
+import math
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Score of a win, less the plies it takes, so faster wins score higher
+WIN = 10 ** 9
+
+# Boards larger than this only search cells near existing marks
+FULL_WIDTH_CELLS = 25
+NEIGHBORHOOD = 2
+
+# Nodes searched between checks of the clock
+CLOCK_INTERVAL = 1024
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its time is up or it has been cancelled.
+    """
+
+
+class Game():
+    """
+    Rules and search for one m x n board with k in a row to win.
+
+    Boards are lists of m rows of n cells, as in tictactoe.py. Internally a
+    position is a pair of bitboards where cell (i, j) is bit i * n + j.
+    """
+
+    def __init__(self, m=3, n=3, k=3):
+        if k > max(m, n):
+            raise ValueError("k in a row must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.cells = m * n
+        self.full = (1 << self.cells) - 1
+
+        # Every line segment of k cells, as a mask
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in DIRECTIONS:
+                    end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append(sum(
+                            1 << ((i + step * di) * n + j + step * dj)
+                            for step in range(k)
+                        ))
+
+        # Cells from the center outwards, the default move ordering
+        center_i, center_j = (m - 1) / 2, (n - 1) / 2
+        self.order = sorted(
+            range(self.cells),
+            key=lambda cell: (abs(cell // n - center_i) + abs(cell % n - center_j), cell)
+        )
+
+        # Cells within NEIGHBORHOOD of each cell, to prune far moves on big boards
+        self.nearby = []
+        for cell in range(self.cells):
+            i, j = divmod(cell, n)
+            self.nearby.append(sum(
+                1 << (a * n + b)
+                for a in range(max(0, i - NEIGHBORHOOD), min(m, i + NEIGHBORHOOD + 1))
+                for b in range(max(0, j - NEIGHBORHOOD), min(n, j + NEIGHBORHOOD + 1))
+            ))
+
+        # Weight of an open window holding c of one player's marks
+        self.weights = [0] + [4 ** c for c in range(1, k + 1)]
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def bits(self, board):
+        """
+        Returns the (x, o) bitboards of a board.
+        """
+        x = o = 0
+        for i, row in enumerate(board):
+            for j, cell in enumerate(row):
+                if cell == X:
+                    x |= 1 << (i * self.n + j)
+                elif cell == O:
+                    o |= 1 << (i * self.n + j)
+        return x, o
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x, o = self.bits(board)
+        return X if x.bit_count() == o.bit_count() else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i, row in enumerate(board)
+                for j, cell in enumerate(row) if cell == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n):
+            raise Exception("Sorry, action has coordinated that are out of bounds.")
+        elif board[i][j] != EMPTY:
+            raise Exception("Sorry, a move was already placed here.")
+
+        result_board = [list(row) for row in board]
+        result_board[i][j] = self.player(board)
+        return result_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        x, o = self.bits(board)
+        for window in self.windows:
+            if x & window == window:
+                return X
+            if o & window == window:
+                return O
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        x, o = self.bits(board)
+        return (x | o) == self.full or self.winner(board) is not None
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winning_player = self.winner(board)
+        return 1 if winning_player == X else -1 if winning_player == O else 0
+
+    def wins(self, bits, cell):
+        """
+        Returns True if the mark at `cell` completes k in a row in `bits`,
+        checking only the four lines through that cell.
+        """
+        n = self.n
+        i, j = divmod(cell, n)
+        for di, dj in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                a, b = i + sign * di, j + sign * dj
+                while 0 <= a < self.m and 0 <= b < n and bits >> (a * n + b) & 1:
+                    count += 1
+                    a += sign * di
+                    b += sign * dj
+            if count >= self.k:
+                return True
+        return False
+
+    def evaluate(self, mine, theirs):
+        """
+        Scores a non-terminal position for the player owning `mine`: every
+        window only one player has marks in counts for that player, more so
+        the fuller it is.
+        """
+        weights = self.weights
+        score = 0
+        for window in self.windows:
+            a = mine & window
+            b = theirs & window
+            if a and not b:
+                score += weights[a.bit_count()]
+            elif b and not a:
+                score -= weights[b.bit_count()]
+        return score
+
+    def moves(self, mine, theirs, first=None):
+        """
+        Returns the empty cells to search, center first, with `first` moved to
+        the front. Large boards only consider cells near existing marks.
+        """
+        occupied = mine | theirs
+        if self.cells > FULL_WIDTH_CELLS and occupied:
+            candidates = 0
+            remaining = occupied
+            while remaining:
+                low = remaining & -remaining
+                candidates |= self.nearby[low.bit_length() - 1]
+                remaining ^= low
+            candidates &= ~occupied
+        else:
+            candidates = self.full & ~occupied
+
+        cells = [cell for cell in self.order if candidates >> cell & 1]
+        if first is not None and first in cells:
+            cells.remove(first)
+            cells.insert(0, first)
+        return cells
+
+    def minimax(self, board, time_limit=None, stats=None, cancel=None):
+        """
+        Returns the optimal action for the current player on the board.
+
+        Searches with iterative-deepening alpha-beta until the whole game
+        tree is covered, a forced result is proven, `time_limit` seconds
+        pass or the `cancel` event is set, and returns the best move of the
+        deepest finished iteration.
+        If a `stats` dict is given, it receives the depth reached, the nodes
+        visited and the score of the move for the player to move.
+        """
+        if self.terminal(board):
+            return None
+        x, o = self.bits(board)
+        if x.bit_count() == o.bit_count():
+            mine, theirs = x, o
+        else:
+            mine, theirs = o, x
+
+        search = Search(self, time_limit, cancel)
+        best_cell = self.moves(mine, theirs)[0]
+        best_score = 0
+        depth = 0
+        for depth, best_score, best_cell in self.deepen(mine, theirs, search):
+            pass
+
+        if stats is not None:
+            stats["depth"] = depth
+            stats["nodes"] = search.nodes
+            stats["score"] = best_score
+        return divmod(best_cell, self.n)
+
+    def deepen(self, mine, theirs, search):
+        """
+        Yields (depth, score, cell) after each finished iteration of an
+        iterative-deepening search for the player owning `mine`, stopping
+        once the whole tree is covered, a forced result is proven or the
+        search times out or is cancelled.
+        """
+        empties = self.cells - (mine | theirs).bit_count()
+        best_cell = self.moves(mine, theirs)[0]
+        for target in range(1, empties + 1):
+            try:
+                best_score, best_cell = search.root(mine, theirs, target, best_cell)
+            except SearchTimeout:
+                return
+            yield target, best_score, best_cell
+            if abs(best_score) >= WIN - self.cells:
+                return
+
+
+class Search():
+    """
+    State of one iterative-deepening search: the game, the deadline, an
+    optional threading.Event that cancels it and the number of nodes
+    visited so far.
+    """
+
+    def __init__(self, game, time_limit=None, cancel=None):
+        self.game = game
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.cancel = cancel
+        self.nodes = 0
+
+    def stopped(self):
+        """
+        Returns True once the deadline has passed or the search is cancelled.
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def root(self, mine, theirs, depth, first):
+        """
+        Returns (score, cell) of the best move for the player owning `mine`
+        with a search `depth` plies deep, trying `first` first.
+        """
+        alpha = -math.inf
+        best_cell = None
+        for cell in self.game.moves(mine, theirs, first):
+            score = -self.negamax(theirs, mine | 1 << cell, cell, depth - 1, -math.inf, -alpha, 1)
+            if best_cell is None or score > alpha:
+                alpha = score
+                best_cell = cell
+        return alpha, best_cell
+
+    def negamax(self, mine, theirs, last, depth, alpha, beta, ply):
+        """
+        Returns the score for the player owning `mine`, to move after the
+        opponent played `last`.
+        """
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0 and self.stopped():
+            raise SearchTimeout
+
+        game = self.game
+        if game.wins(theirs, last):
+            return -(WIN - ply)
+        if (mine | theirs) == game.full:
+            return 0
+        if depth == 0:
+            return game.evaluate(mine, theirs)
+
+        best = -math.inf
+        for cell in game.moves(mine, theirs):
+            score = -self.negamax(theirs, mine | 1 << cell, cell, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+
+# The 3,3,3 game, exposed with the same functions as tictactoe.py
+DEFAULT = Game()
+initial_state = DEFAULT.initial_state
+player = DEFAULT.player
+actions = DEFAULT.actions
+result = DEFAULT.result
+winner = DEFAULT.winner
+terminal = DEFAULT.terminal
+utility = DEFAULT.utility
+minimax = DEFAULT.minimax
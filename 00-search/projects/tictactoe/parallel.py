@@ -0,0 +1,122 @@
+"""
+Root-parallel m,n,k-game search
+
+Each top-level move is searched in its own task on a process pool. The
+first move is searched before the rest are handed out (young brothers
+wait), and every finished move raises a bound shared by all workers, so
+later moves are searched with a narrower window. Moves are compared by
+exact score with ties going to the earliest move in search order, so the
+chosen move is always the one serial search picks at the same depth.
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import mnk
+
+# Shared [score, move index] of the best root move so far and this
+# worker's game, set per process
+shared_best = None
+worker_game = None
+
+# Stands in for minus infinity in the shared integer bound
+NO_BOUND = -(mnk.WIN + 1)
+
+
+def minimax(board, workers=None, game=mnk.DEFAULT, depth=None, stats=None):
+    """
+    Returns the optimal action for the current player on the board, found
+    by a `depth`-ply search (the whole tree by default) split across
+    `workers` processes.
+
+    If a `stats` dict is given, it receives the score of the move for the
+    player to move and the nodes visited across all workers.
+    """
+    if game.terminal(board):
+        return None
+    x, o = game.bits(board)
+    mine, theirs = (x, o) if x.bit_count() == o.bit_count() else (o, x)
+    if depth is None:
+        depth = game.cells - (x | o).bit_count()
+
+    best = multiprocessing.Array("q", [NO_BOUND, 0])
+    cells = game.moves(mine, theirs)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=init_worker,
+                             initargs=(best, game.m, game.n, game.k)) as pool:
+        # Eldest brother first, so the others start with a real bound
+        results = [pool.submit(search_move, mine, theirs, 0, cells[0], depth).result()]
+        futures = [pool.submit(search_move, mine, theirs, index, cell, depth)
+                   for index, cell in enumerate(cells[1:], start=1)]
+        results.extend(future.result() for future in futures)
+
+    best_cell, best_score = None, None
+    for cell, score, exact, _ in results:
+        if exact and (best_score is None or score > best_score):
+            best_cell, best_score = cell, score
+
+    if stats is not None:
+        stats["score"] = best_score
+        stats["nodes"] = sum(nodes for _, _, _, nodes in results)
+    return divmod(best_cell, game.n)
+
+
+def init_worker(best, m, n, k):
+    """
+    Stores the shared bound and builds the game once per worker process.
+    """
+    global shared_best, worker_game
+    shared_best = best
+    worker_game = mnk.Game(m, n, k)
+
+
+def search_move(mine, theirs, index, cell, depth):
+    """
+    Searches the root move at position `index` in search order and returns
+    (cell, score, exact, nodes).
+
+    A move only has to beat the best move so far, or tie it when it comes
+    earlier in search order, so that is the lower edge of its window and
+    ties are settled the same way as in serial search. Moves that fail low
+    are reported as not exact and can never be chosen.
+    """
+    with shared_best.get_lock():
+        best_score, best_index = shared_best[0], shared_best[1]
+    if best_score == NO_BOUND:
+        alpha = -math.inf
+    else:
+        alpha = best_score if best_index < index else best_score - 1
+
+    search = mnk.Search(worker_game)
+    score = -search.negamax(theirs, mine | 1 << cell, cell, depth - 1,
+                            -math.inf, -alpha, 1)
+    exact = score > alpha
+    if exact:
+        with shared_best.get_lock():
+            if (score > shared_best[0]
+                    or (score == shared_best[0] and index < shared_best[1])):
+                shared_best[0] = score
+                shared_best[1] = index
+    return cell, score, exact, search.nodes
+
+
+def serial_minimax(board, game=mnk.DEFAULT, depth=None, stats=None):
+    """
+    Returns the move serial alpha-beta chooses at the same depth as
+    minimax, for checking and benchmarking it.
+    """
+    if game.terminal(board):
+        return None
+    x, o = game.bits(board)
+    mine, theirs = (x, o) if x.bit_count() == o.bit_count() else (o, x)
+    if depth is None:
+        depth = game.cells - (x | o).bit_count()
+
+    search = mnk.Search(game)
+    score, cell = search.root(mine, theirs, depth, None)
+    if stats is not None:
+        stats["score"] = score
+        stats["nodes"] = search.nodes
+    return divmod(cell, game.n)
@@ -2,10 +2,20 @@ import pygame
 import sys
 import time
 
+import book
 import tictactoe as ttt
+from worker import MoveWorker
+
+# Perfect-play book, built on first launch, so every AI move is a lookup
+BOOK = book.load_or_build()
+
+# Frames drawn per second, and the least time the computer takes to move
+FPS = 30
+AI_DELAY = 0.5
 
 pygame.init()
 size = width, height = 600, 400
+clock = pygame.time.Clock()
 
 # Colors
 black = (0, 0, 0)
@@ -16,15 +26,18 @@ screen = pygame.display.set_mode(size)
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+smallFont = pygame.font.Font("OpenSans-Regular.ttf", 16)
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+ai_worker = None
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if ai_worker is not None:
+                ai_worker.cancel()
             sys.exit()
 
     screen.fill(black)
@@ -108,15 +121,29 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, searched in the background so drawing continues
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
+            if ai_worker is None:
+                ai_worker = MoveWorker(board, book=BOOK)
+
+            if ai_worker.from_book():
+                status = "book"
             else:
-                ai_turn = True
+                depth, nodes, rate, best = ai_worker.progress()
+                status = f"depth {depth}  {nodes} nodes  {rate:,.0f} nodes/s  best {best}"
+            status = smallFont.render(status, True, white)
+            statusRect = status.get_rect()
+            statusRect.center = ((width / 2), height - 30)
+            screen.blit(status, statusRect)
+
+            if (ai_worker.done()
+                    and time.perf_counter() - ai_worker.started >= AI_DELAY):
+                if ai_worker.error is not None:
+                    raise RuntimeError("computer move search failed") from ai_worker.error
+                if ai_worker.move is None:
+                    raise RuntimeError("computer move search found no move")
+                board = ttt.result(board, ai_worker.move)
+                ai_worker = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +168,9 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    if ai_worker is not None:
+                        ai_worker.cancel()
+                    ai_worker = None
 
     pygame.display.flip()
+    clock.tick(FPS)
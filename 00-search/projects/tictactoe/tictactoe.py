@@ -9,6 +9,15 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# Order moves are searched in: center, then corners, then edges
+MOVE_ORDER = [(1, 1),
+              (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Perfect-play book consulted by minimax, loaded on first use, or False
+# once there turns out to be no valid book file
+BOOK = None
+
 
 def initial_state():
     """
@@ -132,49 +141,108 @@ def utility(board):
         return 0
 
 
-def minimax(board):
+def minimax(board, stats=None, use_book=True):
     """
     Returns the optimal action for the current player on the board.
 
     Maximize if player is X and minimize if player is O
 
-    Optimizations to consider: Alpha-Beta Pruning
-    """
+    Unless `use_book` is False, the move is read from the perfect-play
+    book when one is available and the board is in it, and no nodes are
+    searched. Otherwise the board is searched as below.
+
+    Alpha-beta pruning over moves ordered center, corners, then edges, so
+    strong replies are tried first and cut off more of the tree. A search
+    also stops as soon as it finds a win for the player to move, since
+    nothing can score better. If a `stats` dict is given, it receives the
+    number of nodes visited.
+    """
+    if use_book and opening_book() is not None:
+        try:
+            action = BOOK.minimax(board)
+        except ValueError:
+            # Boards that cannot arise in a game are not in the book
+            pass
+        else:
+            if stats is not None:
+                stats["nodes"] = 0
+            return action
+
+    nodes = 0
+
     # Helper function to decide best action for player X
-    def max_value(board):
+    def max_value(board, alpha, beta):
+        nonlocal nodes
+        nodes += 1
         if terminal(board):
             return (utility(board), None)
 
-        value = float('-inf')
+        value = -math.inf
         optimal_action = None
-        for potential_action in actions(board):
+        for potential_action in ordered_actions(board):
             potential_board = result(board, potential_action)
-            potential_board_value = min_value(potential_board)[0]
+            potential_board_value = min_value(potential_board, alpha, beta)[0]
             if potential_board_value > value:
                 value = potential_board_value
                 optimal_action = potential_action
+            if value >= beta or value == 1:
+                break
+            alpha = max(alpha, value)
 
         return (value, optimal_action)
 
     # Helper function to decide best action for player O
-    def min_value(board):
+    def min_value(board, alpha, beta):
+        nonlocal nodes
+        nodes += 1
         if terminal(board):
             return (utility(board), None)
 
-        value = float('inf')
+        value = math.inf
         optimal_action = None
-        for potential_action in actions(board):
+        for potential_action in ordered_actions(board):
             potential_board = result(board, potential_action)
-            potential_board_value = max_value(potential_board)[0]
+            potential_board_value = max_value(potential_board, alpha, beta)[0]
             if potential_board_value < value:
                 value = potential_board_value
                 optimal_action = potential_action
+            if value <= alpha or value == -1:
+                break
+            beta = min(beta, value)
 
         return (value, optimal_action)
 
     current_player = player(board)
-    optimal_action = None
-
-    optimal_action = max_value(board)[1] if current_player == X else min_value(board)[1]
+    if current_player == X:
+        optimal_action = max_value(board, -math.inf, math.inf)[1]
+    else:
+        optimal_action = min_value(board, -math.inf, math.inf)[1]
 
+    if stats is not None:
+        stats["nodes"] = nodes
     return optimal_action
+
+
+def opening_book():
+    """
+    Returns the book.Book in book.BOOK_FILE, loading it the first time it
+    is needed, or None if the file is missing or not a valid book. The
+    book is not built here; run 'python book.py build' to create it.
+    """
+    global BOOK
+    if BOOK is None:
+        # Imported here because book imports this module
+        import book
+        try:
+            BOOK = book.Book()
+        except (FileNotFoundError, ValueError):
+            BOOK = False
+    return BOOK or None
+
+
+def ordered_actions(board):
+    """
+    Returns the available actions on the board in MOVE_ORDER.
+    """
+    return [action for action in MOVE_ORDER
+            if board[action[0]][action[1]] == EMPTY]
@@ -0,0 +1,262 @@
+"""
+Tic Tac Toe transposition table
+
+Positions reached by different move orders, or that are rotations and
+reflections of each other, share one entry keyed by a canonical bitboard:
+the smallest of the position's 8 symmetric images. Each entry holds the
+search value, whether it is exact or a bound, and the best move in the
+canonical frame, which is mapped back through the symmetry on lookup.
+"""
+
+import math
+import os
+import sys
+
+import bitboard
+import tictactoe as ttt
+
+# Kinds of value stored in an entry
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Entries are packed into 32 bits: 18-bit key, then value + 1, flag and cell
+KEY_BITS = 18
+NO_CELL = 15
+
+# Saved tables start with MAGIC and the number of entries that follow
+MAGIC = b"TTTTABL1"
+COUNT_BYTES = 4
+ENTRY_BYTES = 4
+
+
+def symmetries():
+    """
+    Returns the 8 symmetries of the board as tuples mapping each cell to
+    its image: the 4 rotations, each with and without a reflection.
+    """
+    maps = []
+    for reflect in (False, True):
+        for turns in range(4):
+            mapping = []
+            for cell in range(9):
+                i, j = divmod(cell, 3)
+                if reflect:
+                    j = 2 - j
+                for _ in range(turns):
+                    i, j = j, 2 - i
+                mapping.append(3 * i + j)
+            maps.append(tuple(mapping))
+    return maps
+
+
+SYMMETRIES = symmetries()
+
+# Inverse of each symmetry, to map canonical moves back to the position
+INVERSES = [tuple(mapping.index(cell) for cell in range(9)) for mapping in SYMMETRIES]
+
+# Image of every 9-bit mask under every symmetry, so transforms are lookups
+IMAGES = [
+    [sum(1 << mapping[cell] for cell in range(9) if bits >> cell & 1)
+     for bits in range(512)]
+    for mapping in SYMMETRIES
+]
+
+
+def canonical(x, o):
+    """
+    Returns (key, symmetry) for the smallest symmetric image of a position,
+    where key packs the image as x << 9 | o.
+    """
+    best_key = None
+    best_symmetry = 0
+    for symmetry, images in enumerate(IMAGES):
+        key = images[x] << 9 | images[o]
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+class TranspositionTable():
+    """
+    Alpha-beta search over bitboards with a table of canonical positions
+    that lives as long as the object, so repeated searches in a process
+    (and, through save and load, across processes) become lookups.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.probes = 0
+        self.hits = 0
+
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on a list-of-lists
+        board, like tictactoe.minimax.
+        """
+        if ttt.terminal(board):
+            return None
+        x, o = bitboard.from_board(board)
+        _, cell = self.search(x, o, x.bit_count() == o.bit_count(), -math.inf, math.inf)
+        return divmod(cell, 3)
+
+    def search(self, x, o, x_to_move, alpha, beta):
+        """
+        Returns (value, cell) for a non-terminal position, with the value
+        from X's point of view and exact when it lies inside (alpha, beta).
+        """
+        key, symmetry = canonical(x, o)
+        self.probes += 1
+        entry = self.entries.get(key)
+        hint = None
+        if entry is not None:
+            value, flag, canonical_cell = entry
+            cell = INVERSES[symmetry][canonical_cell]
+            if (flag == EXACT
+                    or (flag == LOWER and value >= beta)
+                    or (flag == UPPER and value <= alpha)):
+                self.hits += 1
+                return value, cell
+            hint = cell
+
+        original_alpha, original_beta = alpha, beta
+        occupied = x | o
+        best_value = -math.inf if x_to_move else math.inf
+        best_cell = None
+        for cell in ordered_cells(occupied, hint):
+            bit = 1 << cell
+            if x_to_move:
+                child_x, child_o = x | bit, o
+                won = bitboard.has_line(child_x)
+            else:
+                child_x, child_o = x, o | bit
+                won = bitboard.has_line(child_o)
+
+            if won:
+                value = 1 if x_to_move else -1
+            elif occupied | bit == bitboard.FULL:
+                value = 0
+            else:
+                value = self.search(child_x, child_o, not x_to_move, alpha, beta)[0]
+
+            if x_to_move:
+                if value > best_value:
+                    best_value, best_cell = value, cell
+                if best_value >= beta or best_value == 1:
+                    break
+                alpha = max(alpha, best_value)
+            else:
+                if value < best_value:
+                    best_value, best_cell = value, cell
+                if best_value <= alpha or best_value == -1:
+                    break
+                beta = min(beta, best_value)
+
+        if best_value in (1, -1) or original_alpha < best_value < original_beta:
+            flag = EXACT
+        elif best_value <= original_alpha:
+            flag = UPPER
+        else:
+            flag = LOWER
+        self.entries[key] = (best_value, flag, SYMMETRIES[symmetry][best_cell])
+        return best_value, best_cell
+
+    def stats(self):
+        """
+        Returns probe, hit and size counters and the hit rate.
+        """
+        return {
+            "entries": len(self.entries),
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0
+        }
+
+    def save(self, path):
+        """
+        Writes the table to `path`: MAGIC, the entry count, then packed
+        32-bit little-endian entries.
+        """
+        data = b"".join(
+            (key | (value + 1) << KEY_BITS | flag << KEY_BITS + 2
+             | cell << KEY_BITS + 4).to_bytes(ENTRY_BYTES, "little")
+            for key, (value, flag, cell) in sorted(self.entries.items())
+        )
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(self.entries).to_bytes(COUNT_BYTES, "little"))
+            f.write(data)
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """
+        Adds the entries saved at `path` to the table. Raises ValueError,
+        and adds nothing, if the file is not a saved table: a wrong header,
+        a length that does not match the entry count, or an entry that
+        could not have been written by save.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        header = len(MAGIC) + COUNT_BYTES
+        if len(data) < header or data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a transposition table")
+        count = int.from_bytes(data[len(MAGIC):header], "little")
+        if len(data) != header + count * ENTRY_BYTES:
+            raise ValueError(f"{path} should hold {count} entries but has "
+                             f"{len(data) - header} bytes of them")
+
+        entries = {}
+        for start in range(header, len(data), ENTRY_BYTES):
+            entry = int.from_bytes(data[start:start + ENTRY_BYTES], "little")
+            key = entry & (1 << KEY_BITS) - 1
+            value = (entry >> KEY_BITS & 3) - 1
+            flag = entry >> KEY_BITS + 2 & 3
+            cell = entry >> KEY_BITS + 4 & NO_CELL
+            if value > 1 or flag > UPPER or cell > 8 or entry >> KEY_BITS + 8:
+                raise ValueError(f"{path} has an invalid entry {entry:#010x}")
+            entries[key] = (value, flag, cell)
+        self.entries.update(entries)
+
+
+def ordered_cells(occupied, hint=None):
+    """
+    Returns the empty cells in tictactoe.MOVE_ORDER, with `hint` (the best
+    move from an earlier search) first.
+    """
+    cells = [3 * i + j for i, j in ttt.MOVE_ORDER if not occupied >> (3 * i + j) & 1]
+    if hint is not None and hint in cells:
+        cells.remove(hint)
+        cells.insert(0, hint)
+    return cells
+
+
+# Table shared by every caller in the process
+TABLE = TranspositionTable()
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board, using
+    the process-wide transposition table.
+    """
+    return TABLE.minimax(board)
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python transposition.py file")
+    try:
+        TABLE.load(sys.argv[1])
+    except FileNotFoundError:
+        pass
+    except ValueError as error:
+        print(f"Starting a new table: {error}.")
+    TABLE.minimax(ttt.initial_state())
+    TABLE.save(sys.argv[1])
+    print(TABLE.stats())
+
+
+if __name__ == "__main__":
+    main()
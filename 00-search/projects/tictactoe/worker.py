@@ -0,0 +1,94 @@
+"""
+Background move search
+
+Runs an m,n,k-game search on a daemon thread so a UI can keep drawing
+while the computer thinks. The search checks a cancellation event every
+mnk.CLOCK_INTERVAL nodes, and its depth, node count and best move so far
+can be read at any time from the UI thread. A 3,3,3 game with a book.py
+book is answered by a lookup instead of searching.
+"""
+
+import threading
+import time
+
+import mnk
+
+
+class MoveWorker():
+    """
+    Searches for the best move on one board in a background thread, or
+    reads it from `book` when one is given for the 3,3,3 game.
+    """
+
+    def __init__(self, board, game=mnk.DEFAULT, time_limit=None, book=None):
+        x, o = game.bits(board)
+        if x.bit_count() == o.bit_count():
+            self.mine, self.theirs = x, o
+        else:
+            self.mine, self.theirs = o, x
+
+        self.board = board
+        self.game = game
+        self.book = book if (game.m, game.n, game.k) == (3, 3, 3) else None
+        self.cancelled = threading.Event()
+        self.search = mnk.Search(game, time_limit, self.cancelled)
+        self.depth = 0
+        self.best = None
+        self.move = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """
+        Deepens the search until it finishes or is cancelled, publishing the
+        best move after every iteration. If no iteration finishes within
+        the time limit, the first move in search order is played, as
+        mnk.Game.minimax does. An exception from the search is kept in
+        `error` for the UI thread to raise.
+        """
+        try:
+            if self.book is not None:
+                self.best = self.move = self.book.minimax(self.board)
+                return
+            moves = self.game.moves(self.mine, self.theirs)
+            if moves:
+                self.best = divmod(moves[0], self.game.n)
+            for self.depth, _, cell in self.game.deepen(self.mine, self.theirs, self.search):
+                self.best = divmod(cell, self.game.n)
+            if not self.cancelled.is_set():
+                self.move = self.best
+        except Exception as error:
+            self.error = error
+        finally:
+            self.finished = time.perf_counter()
+
+    def done(self):
+        """
+        Returns True once the search has stopped.
+        """
+        return self.finished is not None
+
+    def from_book(self):
+        """
+        Returns True if the move is read from the book rather than searched.
+        """
+        return self.book is not None
+
+    def cancel(self):
+        """
+        Asks the search to stop; it does so within mnk.CLOCK_INTERVAL nodes.
+        """
+        self.cancelled.set()
+
+    def progress(self):
+        """
+        Returns (depth, nodes, nodes per second, best move) of the search so
+        far, where depth is that of the last finished iteration.
+        """
+        nodes = self.search.nodes
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        rate = nodes / elapsed if elapsed > 0 else 0.0
+        return self.depth, nodes, rate, self.best
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+import time
+
+import cnf
+import parallel
+from logic import Symbol, Not, And, Or
+
+# Synthetic knowledge base: random 3-literal clauses near the ratio of
+# clauses to symbols where random problems are hardest
+SYMBOLS = 120
+CLAUSE_RATIO = 4.26
+SEED = 0
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        sys.exit(f"Usage: python benchmark.py {'|'.join(BENCHMARKS)} [symbols] [seed]")
+    symbols = int(sys.argv[2]) if len(sys.argv) > 2 else SYMBOLS
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else SEED
+    BENCHMARKS[sys.argv[1]](symbols, seed)
+
+
+def random_knowledge(symbols, seed):
+    """
+    Returns a random knowledge base of 3-literal disjunctions over
+    `symbols` symbols and a query about the first symbol.
+    """
+    rng = random.Random(seed)
+    pool = [Symbol(f"P{i}") for i in range(symbols)]
+
+    def literal():
+        symbol = rng.choice(pool)
+        return symbol if rng.random() < 0.5 else Not(symbol)
+
+    clauses = int(CLAUSE_RATIO * symbols)
+    return And(*[Or(literal(), literal(), literal()) for _ in range(clauses)]), pool[0]
+
+
+def benchmark_parallel(symbols, seed):
+    """
+    Times the serial clause-database model check against the parallel one
+    with 1 to N workers and checks that they agree.
+    """
+    knowledge, query = random_knowledge(symbols, seed)
+
+    start = time.perf_counter()
+    entailed = cnf.model_check(knowledge, query)
+    serial_time = time.perf_counter() - start
+    print(f"{symbols} symbols, seed {seed}, {parallel.SPLIT_BITS} split bits")
+    print(f"  serial: entailed {entailed}, {serial_time:.3f}s")
+
+    workers = 1
+    while workers <= os.cpu_count():
+        start = time.perf_counter()
+        result = parallel.model_check(knowledge, query, workers)
+        elapsed = time.perf_counter() - start
+        if result != entailed:
+            sys.exit(f"{workers} workers found entailed {result}, serial {entailed}.")
+        print(f"  {workers} workers: {elapsed:.3f}s, {serial_time / elapsed:.2f}x")
+        workers *= 2
+
+
+BENCHMARKS = {
+    "parallel": benchmark_parallel
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Clause database for logic.py sentences
+
+Sentences are compiled to conjunctive normal form with the Tseitin
+encoding: every compound subformula gets a fresh variable defined to be
+equivalent to it, so the clauses grow linearly with the sentence instead
+of exponentially. Variables are positive integers and a literal is a
+variable or its negation, as in DIMACS files. Identical subformulas are
+encoded once.
+"""
+
+from logic import Sentence, Symbol, Not, And, Or, Implication, Biconditional
+
+# Search nodes between checks of the stop event
+STOP_INTERVAL = 1024
+
+
+class Stopped(Exception):
+    pass
+
+
+class CNF():
+    """
+    Clauses over integer variables, with the symbol each variable stands
+    for when it is not an auxiliary Tseitin variable.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.names = [None]
+        self.variables = {}
+        self.symbols = []
+        self.literals = {}
+        self.true = None
+
+    def variable(self, name=None):
+        """
+        Returns the variable for symbol `name`, or a new auxiliary variable
+        if no name is given.
+        """
+        if name is not None and name in self.variables:
+            return self.variables[name]
+        variable = len(self.names)
+        self.names.append(name)
+        if name is not None:
+            self.variables[name] = variable
+            self.symbols.append(variable)
+        return variable
+
+    def add(self, sentence):
+        """
+        Asserts a sentence. Conjunctions are split and disjunctions of
+        literals become single clauses before falling back to Tseitin.
+        """
+        Sentence.validate(sentence)
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or) and all(
+            isinstance(disjunct, Symbol)
+            or (isinstance(disjunct, Not) and isinstance(disjunct.operand, Symbol))
+            for disjunct in sentence.disjuncts
+        ):
+            self.clauses.append(tuple(self.literal(d) for d in sentence.disjuncts))
+        else:
+            self.clauses.append((self.literal(sentence),))
+
+    def literal(self, sentence):
+        """
+        Returns a literal equivalent to a sentence, adding the clauses that
+        define any auxiliary variables it needs.
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, And):
+            inputs = [self.literal(conjunct) for conjunct in sentence.conjuncts]
+            if not inputs:
+                return self.constant()
+            output = self.variable()
+            for literal in inputs:
+                self.clauses.append((-output, literal))
+            self.clauses.append(tuple([output] + [-literal for literal in inputs]))
+        elif isinstance(sentence, Or):
+            inputs = [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            if not inputs:
+                return -self.constant()
+            output = self.variable()
+            for literal in inputs:
+                self.clauses.append((output, -literal))
+            self.clauses.append(tuple([-output] + inputs))
+        elif isinstance(sentence, Implication):
+            antecedent = self.literal(sentence.antecedent)
+            consequent = self.literal(sentence.consequent)
+            output = self.variable()
+            self.clauses.append((-output, -antecedent, consequent))
+            self.clauses.append((output, antecedent))
+            self.clauses.append((output, -consequent))
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            output = self.variable()
+            self.clauses.append((-output, -left, right))
+            self.clauses.append((-output, left, -right))
+            self.clauses.append((output, left, right))
+            self.clauses.append((output, -left, -right))
+        else:
+            raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+        self.literals[sentence] = output
+        return output
+
+    def constant(self):
+        """
+        Returns a variable that is always true.
+        """
+        if self.true is None:
+            self.true = self.variable()
+            self.clauses.append((self.true,))
+        return self.true
+
+    def entails(self, query):
+        """
+        Returns True if the asserted sentences entail `query`.
+        """
+        return not self.satisfiable([-self.literal(query)])
+
+    def satisfiable(self, assumptions=(), stop=None):
+        """
+        Returns True if some assignment of the symbols satisfies every
+        clause and the `assumptions` literals, or None if the `stop` event
+        is set before the search finishes.
+
+        Symbols are assigned one at a time in a depth-first enumeration,
+        and after each assignment unit propagation over the clauses fixes
+        every literal it forces. A clause left with no true literal prunes
+        the whole subtree. Auxiliary variables are defined by their inputs,
+        so once every symbol is assigned without a conflict, propagation has
+        assigned the rest and the assignment is a model.
+        """
+        # Clauses by literal; negative literals index from the end
+        occurrences = [[] for _ in range(2 * len(self.names))]
+        clauses = self.clauses + [(literal,) for literal in assumptions]
+        for index, clause in enumerate(clauses):
+            for literal in clause:
+                occurrences[literal].append(index)
+
+        value = [None] * len(self.names)
+        trail = []
+        nodes = 0
+
+        def assign(literal):
+            """
+            Makes `literal` true and propagates, returning False on conflict.
+            """
+            pending = [literal]
+            while pending:
+                literal = pending.pop()
+                variable = abs(literal)
+                if value[variable] is not None:
+                    if value[variable] != (literal > 0):
+                        return False
+                    continue
+                value[variable] = literal > 0
+                trail.append(variable)
+
+                # Clauses that just lost a literal may now be unit or false
+                for index in occurrences[-literal]:
+                    unassigned = None
+                    count = 0
+                    for other in clauses[index]:
+                        current = value[abs(other)]
+                        if current is None:
+                            unassigned = other
+                            count += 1
+                        elif current == (other > 0):
+                            break
+                    else:
+                        if count == 0:
+                            return False
+                        if count == 1:
+                            pending.append(unassigned)
+            return True
+
+        def undo(mark):
+            while len(trail) > mark:
+                value[trail.pop()] = None
+
+        def search():
+            """
+            Enumerates the symbols depth first with an explicit stack of
+            [position, trail mark, negated] decisions, so deep problems do
+            not run into the recursion limit.
+            """
+            nonlocal nodes
+            decisions = []
+            position = 0
+            while True:
+                nodes += 1
+                if stop is not None and nodes % STOP_INTERVAL == 0 and stop.is_set():
+                    raise Stopped
+                while position < len(self.symbols) and value[self.symbols[position]] is not None:
+                    position += 1
+                if position == len(self.symbols):
+                    return True
+                decisions.append([position, len(trail), False])
+                if assign(self.symbols[position]):
+                    position += 1
+                    continue
+
+                # Flip the deepest decision not yet negated, dropping the rest
+                while True:
+                    if not decisions:
+                        return False
+                    decision = decisions[-1]
+                    position, mark, negated = decision
+                    undo(mark)
+                    if negated:
+                        decisions.pop()
+                        continue
+                    decision[2] = True
+                    if assign(-self.symbols[position]):
+                        position += 1
+                        break
+
+        # Unit clauses and assumptions hold in every model
+        for clause in clauses:
+            if not clause or (len(clause) == 1 and not assign(clause[0])):
+                return False
+        try:
+            return search()
+        except Stopped:
+            return None
+
+
+def model_check(knowledge, query):
+    """Checks if knowledge base entails query, on its clause database."""
+    database = CNF()
+    database.add(knowledge)
+    return database.entails(query)
@@ -0,0 +1,287 @@
+"""
+Model counting for logic.py knowledge bases
+
+Counts the models of a knowledge base over its symbols, and the fraction
+of them in which each symbol or query holds, without enumerating them.
+The knowledge base is compiled with cnf.CNF and counted by DPLL: unit
+propagation, then splitting the remaining clauses into components that
+share no variables, whose counts multiply. Each component is counted
+once, by branching on its most frequent variable, and cached by its
+clauses, so the same sub-problem reached along different branches or
+queries is never counted twice.
+
+The search is recorded as a decision-DNNF circuit of AND nodes (fixed
+literals, free variables and independent components) and OR nodes (the
+two branches on a variable). One pass down the circuit then gives the
+number of models in which every variable is true, so all marginals cost
+about as much as one count.
+
+Tseitin variables are fixed by the symbols they are defined from, so the
+number of models over all variables equals the number over the symbols.
+"""
+
+from cnf import CNF
+
+# Node kinds in the circuit
+AND = 0
+OR = 1
+
+
+class ModelCounter():
+    """
+    Clause database of a knowledge base and the circuit of every count
+    made on it, whose component nodes are shared between counts.
+    """
+
+    def __init__(self, knowledge):
+        self.database = CNF()
+        self.database.add(knowledge)
+        self.cache = {}
+
+        # Node 0 is the false OR node with no branches
+        self.nodes = [(OR, ())]
+        self.values = [0]
+
+    def compile(self, assumptions=()):
+        """
+        Returns the circuit node for the models of the knowledge base in
+        which every `assumptions` literal is true.
+        """
+        # Tautologies constrain nothing; their variables count as free
+        clauses = [tuple(sorted(set(clause))) for clause in self.database.clauses
+                   if not any(-literal in clause for literal in clause)]
+        clauses.extend((literal,) for literal in assumptions)
+        clauses, assigned = propagate(clauses, ())
+        if clauses is None:
+            return 0
+        variables = set(range(1, len(self.database.names)))
+        return self.evaluate(self.conjoin(clauses, assigned, variables))
+
+    def evaluate(self, task):
+        """
+        Runs a conjoin or component generator to its node. Each one yields
+        the generator for a sub-problem and is sent back that sub-problem's
+        node, so the search keeps an explicit stack of generators rather
+        than recursing once per decision.
+        """
+        stack = [task]
+        result = None
+        while stack:
+            try:
+                request = stack[-1].send(result)
+            except StopIteration as finished:
+                stack.pop()
+                result = finished.value
+                continue
+            stack.append(request)
+            result = None
+        return result
+
+    def conjoin(self, clauses, literals, variables):
+        """
+        Yields the components of the clauses and returns an AND node for
+        `literals` being true and the clauses holding, over `variables`.
+        Variables in neither are free.
+        """
+        children = []
+        for component in components(clauses):
+            child = yield self.component(component)
+            if self.values[child] == 0:
+                return 0
+            children.append(child)
+
+        free = variables - {abs(literal) for literal in literals} - variables_of(clauses)
+        value = 1 << len(free)
+        for child in children:
+            value *= self.values[child]
+        return self.add_node((AND, tuple(children), tuple(literals), tuple(free)), value)
+
+    def component(self, clauses):
+        """
+        Yields both branches on the most frequent variable of a connected
+        set of clauses and returns their OR node over its variables.
+        """
+        key = frozenset(clauses)
+        if key in self.cache:
+            return self.cache[key]
+
+        frequency = {}
+        for clause in clauses:
+            for literal in clause:
+                frequency[abs(literal)] = frequency.get(abs(literal), 0) + 1
+        variable = max(frequency, key=frequency.get)
+
+        branches = []
+        for literal in (variable, -variable):
+            residual, assigned = propagate(clauses, (literal,))
+            if residual is not None:
+                branch = yield self.conjoin(residual, assigned, set(frequency))
+                if self.values[branch]:
+                    branches.append(branch)
+
+        node = self.add_node((OR, tuple(branches)),
+                             sum(self.values[branch] for branch in branches))
+        self.cache[key] = node
+        return node
+
+    def add_node(self, node, value):
+        self.nodes.append(node)
+        self.values.append(value)
+        return len(self.nodes) - 1
+
+    def count(self, assumptions=()):
+        """
+        Returns the number of assignments of the symbols that satisfy the
+        knowledge base and make every `assumptions` literal true.
+        """
+        return self.values[self.compile(assumptions)]
+
+    def probability(self, query):
+        """
+        Returns the fraction of the knowledge base's models in which
+        `query` is true.
+        """
+        literal = self.database.literal(query)
+        total = self.count()
+        if total == 0:
+            raise ValueError("knowledge base has no models")
+        return self.count([literal]) / total
+
+    def marginals(self):
+        """
+        Returns the fraction of models in which each symbol is true, by
+        symbol name.
+
+        Every node's derivative is the number of ways the rest of the
+        circuit completes a model through it, so the models through a node
+        number its derivative times its value. Children always come before
+        their parents, so derivatives are pushed down in reverse order.
+        """
+        root = self.compile()
+        total = self.values[root]
+        if total == 0:
+            raise ValueError("knowledge base has no models")
+
+        derivatives = [0] * (root + 1)
+        derivatives[root] = 1
+        true = [0] * len(self.database.names)
+        for node in range(root, 0, -1):
+            derivative = derivatives[node]
+            if derivative == 0:
+                continue
+            if self.nodes[node][0] == OR:
+                for branch in self.nodes[node][1]:
+                    derivatives[branch] += derivative
+                continue
+
+            _, children, literals, free = self.nodes[node]
+            models = derivative * self.values[node]
+            for literal in literals:
+                if literal > 0:
+                    true[literal] += models
+            for variable in free:
+                true[variable] += models // 2
+            for child in children:
+                derivatives[child] += models // self.values[child]
+
+        return {self.database.names[variable]: true[variable] / total
+                for variable in self.database.symbols}
+
+
+def propagate(clauses, literals):
+    """
+    Makes `literals` true and applies unit propagation. Returns the
+    clauses not yet satisfied, without their false literals, and the set
+    of true literals, or (None, None) on a conflict.
+
+    Clauses are indexed by literal first, so each true literal only
+    touches the clauses it appears in.
+    """
+    occurrences = {}
+    pending = list(literals)
+    for index, clause in enumerate(clauses):
+        if not clause:
+            return None, None
+        if len(clause) == 1:
+            pending.append(clause[0])
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+
+    clauses = list(clauses)
+    satisfied = [False] * len(clauses)
+    true = set()
+    while pending:
+        literal = pending.pop()
+        if literal in true:
+            continue
+        if -literal in true:
+            return None, None
+        true.add(literal)
+
+        for index in occurrences.get(literal, ()):
+            satisfied[index] = True
+        for index in occurrences.get(-literal, ()):
+            if satisfied[index]:
+                continue
+            clause = tuple(other for other in clauses[index] if other != -literal)
+            if not clause:
+                return None, None
+            if len(clause) == 1:
+                pending.append(clause[0])
+            clauses[index] = clause
+    return [clause for index, clause in enumerate(clauses) if not satisfied[index]], true
+
+
+def variables_of(clauses):
+    """
+    Returns the set of variables in the clauses.
+    """
+    return {abs(literal) for clause in clauses for literal in clause}
+
+
+def components(clauses):
+    """
+    Returns the clauses grouped into connected components, where clauses
+    are connected when they share a variable.
+    """
+    parent = {}
+
+    def find(variable):
+        while parent[variable] != variable:
+            parent[variable] = parent[parent[variable]]
+            variable = parent[variable]
+        return variable
+
+    for clause in clauses:
+        roots = []
+        for literal in clause:
+            variable = abs(literal)
+            parent.setdefault(variable, variable)
+            roots.append(find(variable))
+        for root in roots[1:]:
+            parent[find(root)] = find(roots[0])
+
+    groups = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return list(groups.values())
+
+
+def model_count(knowledge):
+    """Returns the number of models of knowledge base over its symbols."""
+    return ModelCounter(knowledge).count()
+
+
+def main():
+    import puzzle
+
+    puzzles = [puzzle.knowledge0, puzzle.knowledge1, puzzle.knowledge2, puzzle.knowledge3]
+    for number, knowledge in enumerate(puzzles):
+        counter = ModelCounter(knowledge)
+        print(f"Puzzle {number}: {counter.count()} models")
+        for name, fraction in counter.marginals().items():
+            print(f"    {name}: {fraction:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,56 @@
+import inspect
 import itertools
+import weakref
 
 
 class Sentence():
+    """
+    Immutable logical sentence. Structurally equal sentences are the same
+    object: constructing one looks its class and operands up in INTERNED
+    and returns the existing node if there is one. The hash is computed
+    when a node is created and its symbol set the first time it is asked
+    for. Keyword arguments are bound to the positional operands of build(),
+    so Symbol(name="A") is Symbol("A").
+
+    Because nodes are shared, nothing changes one in place: And.add returns
+    a new conjunction and leaves the original as it was.
+    """
+
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+    def __new__(cls, *arguments, **keywords):
+        if keywords:
+            try:
+                bound = inspect.signature(cls.build).bind(None, *arguments, **keywords)
+            except TypeError as error:
+                raise TypeError(f"{cls.__name__}() {error}") from None
+            arguments = bound.args[1:]
+        key = (cls, arguments)
+        reference = INTERNED.get(key)
+        sentence = reference() if reference is not None else None
+        if sentence is None:
+            sentence = object.__new__(cls)
+            sentence.build(*arguments)
+            object.__setattr__(sentence, "_hash", hash(key))
+            INTERNED[key] = weakref.KeyedRef(sentence, forget, key)
+        return sentence
+
+    def __setattr__(self, name, value):
+        raise AttributeError("sentences are immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), self.arguments())
+
+    def build(self, *arguments):
+        """Sets the operands of a new node."""
+        raise Exception("nothing to build")
+
+    def arguments(self):
+        """Returns the operands the sentence was constructed from."""
+        return ()
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -13,7 +62,19 @@ class Sentence():
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return set(self.symbol_set())
+
+    def symbol_set(self):
+        """
+        Returns the symbols of the sentence as a frozenset. It is computed
+        once and shared between nodes, so use symbols() for a set to modify.
+        """
+        try:
+            return self._symbols
+        except AttributeError:
+            symbols = union(self.arguments())
+            object.__setattr__(self, "_symbols", symbols)
+            return symbols
 
     @classmethod
     def validate(cls, sentence):
@@ -42,16 +103,46 @@ class Sentence():
             return f"({s})"
 
 
+# Weak references to every live sentence by class and operands, so equal
+# sentences share a node
+INTERNED = {}
+
+
+def forget(reference):
+    """Drops the entry of a sentence that has been garbage collected."""
+    if INTERNED.get(reference.key) is reference:
+        del INTERNED[reference.key]
+
+
+def union(sentences):
+    """
+    Returns the symbols of all the sentences, reusing the set of one of
+    them when it already holds every symbol.
+    """
+    sets = [sentence.symbol_set() for sentence in sentences]
+    if not sets:
+        return frozenset()
+    largest = max(sets, key=len)
+    if all(other is largest or other <= largest for other in sets):
+        return largest
+    return largest.union(*sets)
+
+
 class Symbol(Sentence):
+    __slots__ = ("name",)
 
-    def __init__(self, name):
-        self.name = name
+    def build(self, name):
+        object.__setattr__(self, "name", name)
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+    def arguments(self):
+        return (self.name,)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    def symbol_set(self):
+        try:
+            return self._symbols
+        except AttributeError:
+            object.__setattr__(self, "_symbols", frozenset((self.name,)))
+            return self._symbols
 
     def __repr__(self):
         return self.name
@@ -65,20 +156,16 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
-
 
 class Not(Sentence):
-    def __init__(self, operand):
-        Sentence.validate(operand)
-        self.operand = operand
+    __slots__ = ("operand",)
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+    def build(self, operand):
+        Sentence.validate(operand)
+        object.__setattr__(self, "operand", operand)
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def arguments(self):
+        return (self.operand,)
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +176,17 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
-
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+    __slots__ = ("conjuncts",)
+
+    def build(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
-
-    def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        object.__setattr__(self, "conjuncts", conjuncts)
 
-    def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+    def arguments(self):
+        return self.conjuncts
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -114,8 +195,12 @@ class And(Sentence):
         return f"And({conjunctions})"
 
     def add(self, conjunct):
-        Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
+        """
+        Returns a new conjunction with one more conjunct. Sentences are
+        immutable, so this conjunction is left unchanged and callers must
+        keep the result, as in `knowledge = knowledge.add(conjunct)`.
+        """
+        return And(*self.conjuncts, conjunct)
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -126,23 +211,17 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
-
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    __slots__ = ("disjuncts",)
+
+    def build(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        object.__setattr__(self, "disjuncts", disjuncts)
 
-    def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
-
-    def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+    def arguments(self):
+        return self.disjuncts
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -157,24 +236,18 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
-
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    __slots__ = ("antecedent", "consequent")
+
+    def build(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
-
-    def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        object.__setattr__(self, "antecedent", antecedent)
+        object.__setattr__(self, "consequent", consequent)
 
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+    def arguments(self):
+        return (self.antecedent, self.consequent)
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -188,24 +261,18 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
-
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    __slots__ = ("left", "right")
+
+    def build(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
-
-    def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        object.__setattr__(self, "left", left)
+        object.__setattr__(self, "right", right)
 
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+    def arguments(self):
+        return (self.left, self.right)
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -221,9 +288,6 @@ class Biconditional(Sentence):
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
-
 
 def model_check(knowledge, query):
     """Checks if knowledge base entails query."""
@@ -257,7 +321,7 @@ def model_check(knowledge, query):
                     check_all(knowledge, query, remaining, model_false))
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = knowledge.symbols() | query.symbols()
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
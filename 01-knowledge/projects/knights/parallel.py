@@ -0,0 +1,70 @@
+"""
+Parallel model checking
+
+The knowledge base and negated query are compiled once with cnf.CNF.
+Fixing the first k symbols splits the assignments into 2^k independent
+jobs, each enumerating the remaining symbols under its k assumptions on
+a process pool. The first job to find a counter-model sets an event that
+stops the jobs still running and cancels those not yet started.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cnf import CNF
+
+# Symbols fixed per job when the caller does not choose
+SPLIT_BITS = 6
+
+# Clause database and stop event, set in each worker process
+worker_database = None
+worker_stop = None
+
+
+def model_check(knowledge, query, workers=None, split_bits=SPLIT_BITS):
+    """Checks if knowledge base entails query, on a pool of processes."""
+    database = CNF()
+    database.add(knowledge)
+    negated = -database.literal(query)
+
+    # Only the clauses and symbols are needed by the workers
+    database.literals = {}
+    fixed = database.symbols[:split_bits]
+    jobs = [
+        [negated] + [variable if bits >> k & 1 else -variable
+                     for k, variable in enumerate(fixed)]
+        for bits in range(1 << len(fixed))
+    ]
+
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=init_worker,
+                             initargs=(database, stop)) as pool:
+        futures = [pool.submit(check_job, assumptions) for assumptions in jobs]
+        for future in as_completed(futures):
+            if future.result():
+                stop.set()
+                for pending in futures:
+                    pending.cancel()
+                return False
+    return True
+
+
+def init_worker(database, stop):
+    """
+    Keeps the clause database and stop event for every job in the worker.
+    """
+    global worker_database, worker_stop
+    worker_database = database
+    worker_stop = stop
+
+
+def check_job(assumptions):
+    """
+    Returns True if the job's share of the assignments holds a model of
+    the knowledge base and negated query, None if it was stopped.
+    """
+    if worker_stop.is_set():
+        return None
+    return worker_database.satisfiable(assumptions, worker_stop)
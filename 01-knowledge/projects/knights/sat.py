@@ -0,0 +1,372 @@
+"""
+CDCL SAT solver for logic.py entailment
+
+A knowledge base entails a query exactly when the knowledge base together
+with the negated query has no model. Both are compiled to clauses with
+cnf.CNF and handed to a conflict-driven clause-learning solver: unit
+propagation over two watched literals per clause, decisions by variable
+activity, first-UIP clause learning with non-chronological backjumping,
+restarts, and pure literals fixed before searching.
+"""
+
+import heapq
+
+from cnf import CNF
+
+# Activity decay per conflict and first restart interval and growth
+DECAY = 0.95
+RESTART_CONFLICTS = 100
+RESTART_GROWTH = 1.5
+
+
+class Solver():
+    """
+    Incremental SAT solver over DIMACS-style integer literals. Clauses can
+    be added between calls to solve, and learned clauses are kept apart
+    from the problem clauses and reused by later calls.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.learned = []
+        self.watches = [[], []]
+        self.value = [None]
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.phase = [False]
+        self.order = []
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.increment = 1.0
+        self.ok = True
+        self.stats = {"decisions": 0, "propagations": 0, "conflicts": 0, "learned": 0}
+
+    def reserve(self, variables):
+        """
+        Makes room for variables 1 to `variables`.
+        """
+        while len(self.value) <= variables:
+            self.value.append(None)
+            self.level.append(0)
+            self.reason.append(None)
+            self.activity.append(0.0)
+            self.phase.append(False)
+            self.watches.extend(([], []))
+            heapq.heappush(self.order, (0.0, len(self.value) - 1))
+
+    def literal_value(self, literal):
+        """
+        Returns True or False for an assigned literal, None otherwise.
+        """
+        current = self.value[abs(literal)]
+        if current is None:
+            return None
+        return current == (literal > 0)
+
+    def add_clause(self, literals):
+        """
+        Adds a clause, returning False if the clauses are now unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        self.reserve(max((abs(literal) for literal in literals), default=0))
+        self.backtrack(0)
+
+        clause = []
+        for literal in literals:
+            current = self.literal_value(literal)
+            if current is True or -literal in clause:
+                return True
+            if current is None and literal not in clause:
+                clause.append(literal)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.attach(clause)
+            self.clauses.append(clause)
+        return self.ok
+
+    def attach(self, clause):
+        self.watches[watch_index(clause[0])].append(clause)
+        self.watches[watch_index(clause[1])].append(clause)
+
+    def enqueue(self, literal, reason):
+        variable = abs(literal)
+        self.value[variable] = literal > 0
+        self.level[variable] = len(self.limits)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal forced by unit clauses, returning a falsified
+        clause on conflict and None otherwise.
+        """
+        value = self.value
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            self.stats["propagations"] += 1
+
+            watching = self.watches[watch_index(false_literal)]
+            kept = []
+            for position, clause in enumerate(watching):
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                # Satisfied by the other watch
+                first = clause[0]
+                current = value[abs(first)]
+                if current is not None and current == (first > 0):
+                    kept.append(clause)
+                    continue
+
+                # Move the watch to any literal that is not false
+                for k in range(2, len(clause)):
+                    other = clause[k]
+                    current = value[abs(other)]
+                    if current is None or current == (other > 0):
+                        clause[1], clause[k] = other, false_literal
+                        self.watches[watch_index(other)].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value[abs(first)] is not None:
+                        kept.extend(watching[position + 1:])
+                        watching[:] = kept
+                        return clause
+                    self.enqueue(first, clause)
+            watching[:] = kept
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns (learned clause, backjump level) for a conflict, with the
+        first unique implication point's negation first in the clause.
+        """
+        seen = set()
+        learned = [None]
+        current_level = len(self.limits)
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        literal = None
+
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen or self.level[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.level[variable] == current_level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            seen.discard(abs(literal))
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reason[abs(literal)]
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+        # Watch the deepest remaining literal so the clause is unit after backjumping
+        deepest = max(range(1, len(learned)), key=lambda i: self.level[abs(learned[i])])
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, self.level[abs(learned[1])]
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, len(self.value))
+                          if self.value[v] is None]
+            heapq.heapify(self.order)
+        elif self.value[variable] is None:
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """
+        Undoes every assignment made above decision `level`.
+        """
+        if len(self.limits) <= level:
+            return
+        for literal in self.trail[self.limits[level]:]:
+            variable = abs(literal)
+            self.phase[variable] = self.value[variable]
+            self.value[variable] = None
+            self.reason[variable] = None
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[self.limits[level]:]
+        del self.limits[level:]
+        self.head = len(self.trail)
+
+    def pick(self):
+        """
+        Returns the unassigned variable with the highest activity, or None.
+        """
+        while self.order:
+            activity, variable = heapq.heappop(self.order)
+            if self.value[variable] is None and -activity == self.activity[variable]:
+                return variable
+        for variable in range(1, len(self.value)):
+            if self.value[variable] is None:
+                return variable
+        return None
+
+    def pure_literals(self, assumptions):
+        """
+        Returns literals whose negation appears in no problem clause or
+        assumption. Making them true never turns a satisfiable problem
+        unsatisfiable, and learned clauses follow from the problem clauses.
+        """
+        polarity = {}
+        for clause in self.clauses:
+            for literal in clause:
+                polarity[abs(literal)] = polarity.get(abs(literal), 0) | (1 if literal > 0 else 2)
+        for literal in assumptions:
+            polarity[abs(literal)] = polarity.get(abs(literal), 0) | (1 if literal > 0 else 2)
+        return [variable if mask == 1 else -variable
+                for variable, mask in polarity.items() if mask != 3]
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses and `assumptions` literals together have
+        a model, which is then available from model().
+        """
+        if not self.ok:
+            return False
+        self.reserve(max((abs(literal) for literal in assumptions), default=0))
+        self.backtrack(0)
+        if self.propagate() is not None:
+            self.ok = False
+            return False
+
+        # Assumptions first, then pure literals, each at its own level
+        fixed = list(assumptions)
+        required = len(fixed)
+        fixed.extend(self.pure_literals(assumptions))
+
+        restart = RESTART_CONFLICTS
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.stats["conflicts"] += 1
+                conflicts += 1
+                if not self.limits:
+                    self.ok = False
+                    return False
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.enqueue(learned[0], None)
+                else:
+                    self.attach(learned)
+                    self.learned.append(learned)
+                    self.stats["learned"] += 1
+                    self.enqueue(learned[0], learned)
+                self.increment /= DECAY
+                continue
+
+            if conflicts >= restart:
+                restart = int(restart * RESTART_GROWTH)
+                conflicts = 0
+                self.backtrack(0)
+                continue
+
+            level = len(self.limits)
+            if level < len(fixed):
+                literal = fixed[level]
+                current = self.literal_value(literal)
+                if current is False and level < required:
+                    return False
+                self.limits.append(len(self.trail))
+                if current is None:
+                    self.enqueue(literal, None)
+                continue
+
+            variable = self.pick()
+            if variable is None:
+                return True
+            self.stats["decisions"] += 1
+            self.limits.append(len(self.trail))
+            self.enqueue(variable if self.phase[variable] else -variable, None)
+
+    def model(self):
+        """
+        Returns the current assignment as a set of true literals.
+        """
+        return {variable if current else -variable
+                for variable, current in enumerate(self.value) if current is not None}
+
+
+def watch_index(literal):
+    """
+    Returns the slot of a literal in the watch lists.
+    """
+    return 2 * literal if literal > 0 else -2 * literal + 1
+
+
+class KnowledgeBase():
+    """
+    Sentences told so far, kept compiled in one clause database and one
+    solver. Telling a sentence only adds its new clauses, and each query
+    is a single assumption, so later queries reuse the clauses learned by
+    earlier ones.
+    """
+
+    def __init__(self, *sentences):
+        self.database = CNF()
+        self.solver = Solver()
+        self.loaded = 0
+        for sentence in sentences:
+            self.tell(sentence)
+
+    def tell(self, sentence):
+        """
+        Adds a sentence to the knowledge base.
+        """
+        self.database.add(sentence)
+        self.load()
+
+    def ask(self, query):
+        """
+        Returns True if the knowledge base entails `query`.
+        """
+        literal = self.database.literal(query)
+        self.load()
+        return not self.solver.solve([-literal])
+
+    def consistent(self):
+        """
+        Returns True if the knowledge base has a model.
+        """
+        return self.solver.solve()
+
+    def load(self):
+        """
+        Hands the clauses compiled since the last call to the solver.
+        """
+        for clause in self.database.clauses[self.loaded:]:
+            self.solver.add_clause(clause)
+        self.loaded = len(self.database.clauses)
+
+
+def model_check(knowledge, query):
+    """Checks if knowledge base entails query, with a SAT solver."""
+    return KnowledgeBase(knowledge).ask(query)
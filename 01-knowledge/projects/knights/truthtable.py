@@ -0,0 +1,127 @@
+"""
+Compiled truth tables for logic.py sentences
+
+A sentence is flattened once into a list of instructions over numbered
+registers, identical subformulas sharing a register. Every assignment of
+n symbols is an integer whose bit k is the value of symbol k, so a block
+of consecutive assignments is a NumPy range and each symbol's column is a
+shift and a mask. The program then runs once per block on boolean
+vectors, CHUNK_BITS assignments at a time, instead of once per model
+through Sentence.evaluate.
+"""
+
+import numpy as np
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+# Assignments evaluated per block, as a power of two
+CHUNK_BITS = 16
+
+# Instruction opcodes
+SYMBOL = 0
+CONSTANT = 1
+NOT = 2
+AND = 3
+OR = 4
+IMPLIES = 5
+IFF = 6
+
+
+class TruthTable():
+    """
+    Program that evaluates some sentences under blocks of assignments of
+    their symbols.
+    """
+
+    def __init__(self, *sentences):
+        self.symbols = sorted(frozenset().union(*(s.symbol_set() for s in sentences)))
+        self.positions = {name: k for k, name in enumerate(self.symbols)}
+        self.instructions = []
+        self.registers = {}
+        self.outputs = [self.compile(sentence) for sentence in sentences]
+
+    def compile(self, sentence):
+        """
+        Appends the instructions for a sentence and returns its register.
+        """
+        if sentence in self.registers:
+            return self.registers[sentence]
+
+        if isinstance(sentence, Symbol):
+            instruction = (SYMBOL, self.positions[sentence.name])
+        elif isinstance(sentence, Not):
+            instruction = (NOT, self.compile(sentence.operand))
+        elif isinstance(sentence, (And, Or)):
+            operands = sentence.conjuncts if isinstance(sentence, And) else sentence.disjuncts
+            if not operands:
+                instruction = (CONSTANT, isinstance(sentence, And))
+            else:
+                opcode = AND if isinstance(sentence, And) else OR
+                instruction = (opcode,) + tuple(self.compile(operand) for operand in operands)
+        elif isinstance(sentence, Implication):
+            instruction = (IMPLIES, self.compile(sentence.antecedent),
+                           self.compile(sentence.consequent))
+        elif isinstance(sentence, Biconditional):
+            instruction = (IFF, self.compile(sentence.left), self.compile(sentence.right))
+        else:
+            raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+        self.instructions.append(instruction)
+        register = len(self.instructions) - 1
+        self.registers[sentence] = register
+        return register
+
+    def evaluate(self, start, stop):
+        """
+        Returns one boolean vector per sentence, holding its value under
+        each assignment from `start` up to `stop`.
+        """
+        index = np.arange(start, stop, dtype=np.int64)
+        values = []
+        for instruction in self.instructions:
+            opcode = instruction[0]
+            if opcode == SYMBOL:
+                value = (index >> instruction[1] & 1).astype(bool)
+            elif opcode == CONSTANT:
+                value = np.full(len(index), instruction[1])
+            elif opcode == NOT:
+                value = ~values[instruction[1]]
+            elif opcode == AND:
+                value = values[instruction[1]].copy()
+                for operand in instruction[2:]:
+                    value &= values[operand]
+            elif opcode == OR:
+                value = values[instruction[1]].copy()
+                for operand in instruction[2:]:
+                    value |= values[operand]
+            elif opcode == IMPLIES:
+                value = ~values[instruction[1]] | values[instruction[2]]
+            else:
+                value = values[instruction[1]] == values[instruction[2]]
+            values.append(value)
+        return [values[output] for output in self.outputs]
+
+    def blocks(self, chunk_bits=CHUNK_BITS):
+        """
+        Yields (start, stop) ranges covering every assignment.
+        """
+        total = 1 << len(self.symbols)
+        size = 1 << chunk_bits
+        for start in range(0, total, size):
+            yield start, min(start + size, total)
+
+    def model(self, assignment):
+        """
+        Returns the model dict for an assignment number.
+        """
+        return {name: bool(assignment >> k & 1) for k, name in enumerate(self.symbols)}
+
+
+def model_check(knowledge, query, chunk_bits=CHUNK_BITS):
+    """Checks if knowledge base entails query, a block of models at a time."""
+    table = TruthTable(knowledge, query)
+    for start, stop in table.blocks(chunk_bits):
+        knowledge_values, query_values = table.evaluate(start, stop)
+        if (knowledge_values & ~query_values).any():
+            return False
+    return True